@@ -8,26 +8,35 @@ import game_assets
 import mk_functions
 import screen_coords
 from champion import Champion
+from board_model import BoardModel
 import comps
 import ocr
 import game_functions
+import input_executor
 import arena_functions
+import instrumentation
+import item_planner
+import screen_capture
+import waits
+from live_client import LIVE_CLIENT
+from gold_tracker import GoldTracker
+from perception import PerceptionScheduler
 
 
 class Arena:
     """Arena class that handles game logic such as board and bench state"""
 
     # pylint: disable=too-many-instance-attributes,too-many-public-methods
-    def __init__(self, message_queue) -> None:
+    def __init__(self, message_queue, perception: PerceptionScheduler | None = None) -> None:
         self.message_queue = message_queue
+        self.perception = perception if perception is not None else PerceptionScheduler()
+        self.gold = GoldTracker(self.perception)
         self.board_size = 0
-        self.bench: list[None] = [None] * 9
+        self.model = BoardModel()
         self.anvil_free: list[bool] = [False] * 9
-        self.board: list = []
         self.board_unknown: list = []
         self.unknown_slots: list = comps.get_unknown_slots()
         self.champs_to_buy: dict = comps.champions_to_buy()
-        self.board_names: list = []
         self.items: list = []
         self.final_comp = False
         self.level = 0
@@ -35,65 +44,62 @@ class Arena:
         self.spam_roll = False
         self.have_headliner = False
 
+    @instrumentation.timed
     def fix_bench_state(self) -> None:
-        """Iterates through bench and fixes invalid slots"""
-        bench_occupied: list = arena_functions.bench_occupied_check()
-        for index, slot in enumerate(self.bench):
-            if slot is None and bench_occupied[index]:
-                mk_functions.right_click(screen_coords.BENCH_LOC[index].get_coords())
-                champ_name: str = ocr.get_text(
-                    screenxy=screen_coords.PANEL_NAME_LOC.get_coords(),
-                    scale=3,
-                    psm=7,
-                    whitelist=ocr.ALPHABET_WHITELIST,
+        """Fixes the bench slots whose pixels changed or that our own actions touched"""
+        bench_occupied: list = self.perception.refresh("bench_occupied")
+        appeared, vanished = self.model.mismatches(self.perception.frame, bench_occupied)
+        for index in vanished:
+            self.model.clear_bench(index)
+        for index in appeared:
+            mk_functions.right_click(screen_coords.BENCH_LOC[index].get_coords())
+            champ_name: str = ocr.get_text(
+                screenxy=screen_coords.PANEL_NAME_LOC.get_coords(),
+                scale=3,
+                psm=7,
+                whitelist=ocr.ALPHABET_WHITELIST,
+            )
+            if self.champs_to_buy.get(champ_name, 0) > 0:
+                print(
+                    f"  The unknown champion {champ_name} exists in comps, keeping it."
                 )
-                if self.champs_to_buy.get(champ_name, 0) > 0:
-                    print(
-                        f"  The unknown champion {champ_name} exists in comps, keeping it."
-                    )
-                    self.bench[index] = Champion(
+                self.model.set_bench(
+                    index,
+                    Champion(
                         name=champ_name,
                         coords=screen_coords.BENCH_LOC[index].get_coords(),
                         build=comps.COMP[champ_name]["items"].copy(),
                         slot=index,
-                        size=game_assets.CHAMPIONS[champ_name]["Board Size"],
+                        size=game_assets.champion_board_size(champ_name),
                         final_comp=comps.COMP[champ_name]["final_comp"],
-                    )
-                    self.champs_to_buy[champ_name] -= 1
-                else:
-                    self.bench[index] = "?"
-                continue
-            if isinstance(slot, str) and not bench_occupied[index]:
-                self.bench[index] = None
-                continue
-            if isinstance(slot, Champion) and not bench_occupied[index]:
-                self.bench[index] = None
+                    ),
+                )
+                self.champs_to_buy[champ_name] -= 1
+            else:
+                self.model.set_bench(index, "?")
 
     def bought_champion(self, name: str, slot: int) -> None:
         """Purchase champion and creates champion instance"""
-        self.bench[slot] = Champion(
-            name=name,
-            coords=screen_coords.BENCH_LOC[slot].get_coords(),
-            build=comps.COMP[name]["items"].copy(),
-            slot=slot,
-            size=game_assets.CHAMPIONS[name]["Board Size"],
-            final_comp=comps.COMP[name]["final_comp"],
+        self.model.set_bench(
+            slot,
+            Champion(
+                name=name,
+                coords=screen_coords.BENCH_LOC[slot].get_coords(),
+                build=comps.COMP[name]["items"].copy(),
+                slot=slot,
+                size=game_assets.champion_board_size(name),
+                final_comp=comps.COMP[name]["final_comp"],
+            ),
         )
         mk_functions.move_mouse(screen_coords.DEFAULT_LOC.get_coords())
-        sleep(0.5)
+        if not waits.wait_until(waits.bench_slot_occupied(slot), timeout=0.5):
+            # Either the click missed or the champion upgraded an existing one, the predicted cost can't be trusted
+            self.gold.sync()
         self.fix_bench_state()
 
     def have_champion(self) -> Champion | None:
         """Checks the bench to see if champion exists"""
-        return next(
-            (
-                champion
-                for champion in self.bench
-                if isinstance(champion, Champion)
-                and champion.name not in self.board_names
-            ),
-            None,
-        )
+        return self.model.movable_champion()
 
     def move_known(self, champion: Champion) -> None:
         """Moves champion to the board"""
@@ -101,46 +107,55 @@ class Arena:
         destination: tuple = screen_coords.BOARD_LOC[
             comps.COMP[champion.name]["board_position"]
         ].get_coords()
-        mk_functions.left_click(champion.coords)
-        sleep(0.1)
-        mk_functions.left_click(destination)
+        # The bench slot's health bar goes away once the champion is picked up
+        pick_up = input_executor.click(
+            champion.coords, until=waits.bench_slot_occupied(champion.index, occupied=False)
+        )
+        input_executor.submit([pick_up, input_executor.click(destination)])
         champion.coords = destination
-        self.board.append(champion)
-        self.board_names.append(champion.name)
-        self.bench[champion.index] = None
+        self.model.clear_bench(champion.index)
+        self.model.add_to_board(champion)
         champion.index = comps.COMP[champion.name]["board_position"]
         self.board_size += champion.size
 
     def move_unknown(self) -> None:
         """Moves unknown champion to the board"""
-        for index, champion in enumerate(self.bench):
-            if isinstance(champion, str):
-                print(f"  Moving {champion} to board")
-                mk_functions.left_click(screen_coords.BENCH_LOC[index].get_coords())
-                sleep(0.1)
-                mk_functions.left_click(
+        index: int = self.model.first_unknown()
+        if index == -1:
+            return
+        champion: str = self.model.bench[index]
+        print(f"  Moving {champion} to board")
+        input_executor.submit(
+            [
+                input_executor.click(
+                    screen_coords.BENCH_LOC[index].get_coords(),
+                    until=waits.bench_slot_occupied(index, occupied=False),
+                ),
+                input_executor.click(
                     screen_coords.BOARD_LOC[
                         self.unknown_slots[len(self.board_unknown)]
                     ].get_coords()
-                )
-                self.bench[index] = None
-                self.board_unknown.append(champion)
-                self.board_size += 1
-                return
+                ),
+            ]
+        )
+        self.model.clear_bench(index)
+        self.board_unknown.append(champion)
+        self.board_size += 1
 
     def sell_bench(self) -> None:
         """Sells all of the champions on the bench"""
-        for index, _ in enumerate(self.bench):
-            mk_functions.press_e(screen_coords.BENCH_LOC[index].get_coords())
-            self.bench[index] = None
+        input_executor.submit([self.sell_command(index) for index in range(len(screen_coords.BENCH_LOC))])
+        self.model.clear_all()
 
     def unknown_in_bench(self) -> bool:
         """Sells all of the champions on the bench"""
-        return any(isinstance(slot, str) for slot in self.bench)
+        return self.model.first_unknown() != -1
 
+    @instrumentation.timed
     def move_champions(self) -> None:
         """Moves champions to the board"""
-        self.level: int = arena_functions.get_level()
+        self.perception.invalidate("shop")
+        self.level: int = self.perception.read("level")
         while self.level > self.board_size:
             champion: Champion | None = self.have_champion()
             if champion is not None:
@@ -149,9 +164,9 @@ class Arena:
                 self.move_unknown()
             else:
                 bought_unknown = False
-                shop: list = arena_functions.get_shop()
+                shop: list = self.perception.read("shop")
                 for champion in shop:
-                    gold: int = arena_functions.get_gold()
+                    gold: int = self.gold.current()
                     valid_champ: bool = (
                         champion[1] in game_assets.CHAMPIONS
                         and game_assets.champion_gold_cost(champion[1]) <= gold
@@ -162,11 +177,16 @@ class Arena:
 
                     if valid_champ:
                         none_slot: int = arena_functions.empty_slot()
+                        if none_slot == -1:
+                            # Bench is full, it gets sold below to keep track of the board
+                            break
                         mk_functions.left_click(
                             screen_coords.BUY_LOC[champion[0]].get_coords()
                         )
+                        self.gold.spend(game_assets.champion_gold_cost(champion[1]))
+                        self.perception.invalidate("shop", "bench_occupied")
                         sleep(0.2)
-                        self.bench[none_slot] = f"{champion[1]}"
+                        self.model.set_bench(none_slot, f"{champion[1]}")
                         self.move_unknown()
                         bought_unknown = True
                         break
@@ -176,6 +196,7 @@ class Arena:
                     self.sell_bench()
                     return
 
+    @instrumentation.timed
     def replace_unknown(self) -> None:
         """Replaces unknown champion"""
         champion: Champion | None = self.have_champion()
@@ -189,31 +210,47 @@ class Arena:
             self.board_size -= 1
             self.move_known(champion)
 
+    @staticmethod
+    def sell_command(index: int) -> input_executor.InputCommand:
+        """Returns the command that sells the bench slot and waits until the slot is empty"""
+        return input_executor.press(
+            "e",
+            screen_coords.BENCH_LOC[index].get_coords(),
+            until=waits.bench_slot_occupied(index, occupied=False),
+        )
+
+    @instrumentation.timed
     def bench_cleanup(self) -> None:
         """Sells unknown champions"""
         self.anvil_free: list[bool] = [False] * 9
-        for index, champion in enumerate(self.bench):
+        sells: list = []
+        for index, champion in enumerate(self.model.bench):
             if champion == "?" or isinstance(champion, str):
                 print("  Selling unknown champion")
-                mk_functions.press_e(screen_coords.BENCH_LOC[index].get_coords())
-                self.bench[index] = None
+                sells.append(self.sell_command(index))
+                self.model.clear_bench(index)
                 self.anvil_free[index] = True
             elif isinstance(champion, Champion):
                 if (
                     self.champs_to_buy.get(champion.name, -1) < 0
-                    and champion.name in self.board_names
+                    and self.model.on_board(champion.name)
                 ):
                     print("  Selling unknown champion")
-                    mk_functions.press_e(screen_coords.BENCH_LOC[index].get_coords())
-                    self.bench[index] = None
+                    sells.append(self.sell_command(index))
+                    self.model.clear_bench(index)
                     self.anvil_free[index] = True
+        if sells:
+            input_executor.submit(sells)
 
+    @instrumentation.timed
     def clear_anvil(self) -> None:
         """Clears anvil on the bench, selects middle item"""
-        for index, champion in enumerate(self.bench):
+        input_executor.wait_idle()
+        prompt_shown = waits.anvil_prompt_changed()
+        for index, champion in enumerate(self.model.bench):
             if champion is None and not self.anvil_free[index]:
                 mk_functions.press_e(screen_coords.BENCH_LOC[index].get_coords())
-        sleep(0.5)
+        waits.wait_until(prompt_shown, timeout=0.5)
         anvil_msg: str = ocr.get_text(
             screenxy=screen_coords.ANVIL_MSG_POS.get_coords(),
             scale=3,
@@ -222,67 +259,30 @@ class Arena:
         )
         if anvil_msg == "ChooseOne":
             print("  Clear anvil")
+            prompt_gone = waits.anvil_prompt_changed()
             mk_functions.left_click(screen_coords.BUY_LOC[2].get_coords())
-            sleep(1)
+            waits.wait_until(prompt_gone, timeout=1)
 
+    @instrumentation.timed
     def place_items(self) -> None:
-        """Iterates through items and tries to add them to champion"""
+        """Places bench items following the plan that completes the most items"""
         self.items = arena_functions.get_items()
         print(f"  Items: {list(filter((None).__ne__, self.items))}")
-        for index, _ in enumerate(self.items):
-            if self.items[index] is not None:
-                self.add_item_to_champs(index)
-
-    def add_item_to_champs(self, item_index: int) -> None:
-        """Iterates through champions in the board and checks if the champion needs items"""
-        for champ in self.board:
-            if champ.does_need_items() and self.items[item_index] is not None:
-                self.add_item_to_champ(item_index, champ)
-
-    def add_item_to_champ(self, item_index: int, champ: Champion) -> None:
-        """Takes item index and champ and applies the item"""
-        item = self.items[item_index]
-        if item in game_assets.FULL_ITEMS:
-            if item in champ.build:
-                mk_functions.left_click(
-                    screen_coords.ITEM_POS[item_index][0].get_coords()
-                )
-                mk_functions.left_click(champ.coords)
-                print(f"  Placed {item} on {champ.name}")
-                champ.completed_items.append(item)
-                champ.build.remove(item)
-                self.items[self.items.index(item)] = None
-        elif len(champ.current_building) == 0:
-            item_to_move: None = None
-            for build_item in champ.build:
-                build_item_components: list = list(game_assets.FULL_ITEMS[build_item])
-                if item in build_item_components:
-                    item_to_move: None = item
-                    build_item_components.remove(item_to_move)
-                    champ.current_building.append(
-                        (build_item, build_item_components[0])
-                    )
-                    champ.build.remove(build_item)
-            if item_to_move is not None:
-                mk_functions.left_click(
-                    screen_coords.ITEM_POS[item_index][0].get_coords()
-                )
-                mk_functions.left_click(champ.coords)
-                print(f"  Placed {item} on {champ.name}")
-                self.items[self.items.index(item)] = None
-        else:
-            for builditem in champ.current_building:
-                if item == builditem[1]:
-                    mk_functions.left_click(
-                        screen_coords.ITEM_POS[item_index][0].get_coords()
-                    )
-                    mk_functions.left_click(champ.coords)
-                    champ.completed_items.append(builditem[0])
-                    champ.current_building.clear()
-                    self.items[self.items.index(item)] = None
-                    print(f"  Placed {item} on {champ.name}")
-                    print(f"  Completed {builditem[0]}")
-                    return
+        clicks: list = []
+        for placement in item_planner.plan_items(self.items, self.model.board_champions()):
+            # The icon leaves the item bench once the item is picked up
+            picked_up = waits.region_changed(screen_coords.ITEM_ICON_POS[placement.slot].get_coords())
+            clicks.append(
+                input_executor.click(screen_coords.ITEM_POS[placement.slot][0].get_coords(), until=picked_up)
+            )
+            clicks.append(input_executor.click(placement.champion.coords))
+            item_planner.apply(placement)
+            self.items[placement.slot] = None
+            print(f"  Placed {placement.item} on {placement.champion.name}")
+            if placement.kind != item_planner.START:
+                print(f"  Completed {placement.result}")
+        if clicks:
+            input_executor.submit(clicks)
 
     def fix_unknown(self) -> None:
         """Checks if the item passed in arg one is valid"""
@@ -295,28 +295,22 @@ class Arena:
 
     def remove_champion(self, champion: Champion) -> None:
         """Remove the specify champion in both board and bench"""
-        for index, slot in enumerate(self.bench):
-            if isinstance(slot, Champion) and slot.name == champion.name:
-                mk_functions.press_e(slot.coords)
-                self.bench[index] = None
+        for index in self.model.bench_slots(champion.name):
+            mk_functions.press_e(self.model.clear_bench(index).coords)
 
         # Remove all instances of champion in champs_to_buy
         self.champs_to_buy.pop(champion.name)
 
         mk_functions.press_e(champion.coords)
-        self.board_names.remove(champion.name)
+        self.model.remove_from_board(champion)
         self.board_size -= champion.size
-        self.board.remove(champion)
 
+    @instrumentation.timed
     def final_comp_check(self) -> None:
         """Checks the board and replaces champions not in final comp"""
-        for slot in self.bench:
-            if (
-                isinstance(slot, Champion)
-                and slot.final_comp
-                and slot.name not in self.board_names
-            ):
-                for champion in self.board:
+        for slot in self.model.bench_champions():
+            if slot.final_comp and not self.model.on_board(slot.name):
+                for champion in self.model.board_champions():
                     if not champion.final_comp and champion.size == slot.size:
                         print(f"  Replacing {champion.name} with {slot.name}")
                         self.remove_champion(champion)
@@ -325,8 +319,9 @@ class Arena:
 
     def tacticians_crown_check(self) -> None:
         """Checks if the item from carousel is tacticians crown"""
+        tooltip_shown = waits.region_changed(screen_coords.ITEM_POS[0][1].get_coords())
         mk_functions.move_mouse(screen_coords.ITEM_POS[0][0].get_coords())
-        sleep(0.5)
+        waits.wait_until(tooltip_shown, timeout=0.5)
         item: str = ocr.get_text(
             screenxy=screen_coords.ITEM_POS[0][1].get_coords(),
             scale=3,
@@ -343,41 +338,51 @@ class Arena:
         except TypeError:
             print("  Item could not be read for Tacticians Check")
 
+    @instrumentation.timed
     def spend_gold(self, speedy=False) -> None:
         """Spends gold every round"""
         first_run = True
         min_gold = 100 if speedy else (24 if self.spam_roll else 56)
-        while first_run or arena_functions.get_gold() >= min_gold:
+        self.perception.invalidate("shop")
+        # Selling since the last read changed the gold, everything after this is our own spending
+        self.gold.sync()
+        while first_run or self.gold.at_least(min_gold):
             if not first_run:
-                if arena_functions.get_level() != 10:
+                if self.perception.read("level") != 10:
                     mk_functions.buy_xp()
+                    LIVE_CLIENT.invalidate()
+                    self.perception.invalidate("level")
+                    self.gold.spend(game_assets.XP_COST)
                     print("  Purchasing XP")
                 mk_functions.reroll()
+                self.perception.invalidate("shop")
+                self.gold.spend(game_assets.REROLL_COST)
                 print("  Rerolling shop")
-            shop: list = arena_functions.get_shop()
+            shop: list = self.perception.read("shop")
+            frame = self.perception.frame
             print(f"  Shop: {shop}")
             for champion in shop:
                 if (
                     self.champs_to_buy.get(champion[1], -1) >= 0
-                    and arena_functions.get_gold()
-                    - game_assets.CHAMPIONS[champion[1]]["Gold"]
+                    and self.gold.current()
+                    - game_assets.champion_gold_cost(champion[1])
                     >= 0
                 ):
                     if (
-                        champion[0] != 4 or not arena_functions.check_headliner()
+                        champion[0] != 4 or not arena_functions.check_headliner(frame)
                     ) and self.champs_to_buy.get(champion[1], -1) > 0:
                         self.buy_champion(champion, 1)
                     elif (
                         champion[0] == 4
                         and (
-                            arena_functions.check_headliner()
+                            arena_functions.check_headliner(frame)
                             & comps.get_headliner_tag(champion[1])
                             != 0
                         )
                         and not self.have_headliner
                         and comps.COMP[champion[1]]["final_comp"]
-                        and arena_functions.get_gold()
-                        - game_assets.CHAMPIONS[champion[1]]["Gold"] * 3
+                        and self.gold.current()
+                        - game_assets.champion_gold_cost(champion[1]) * 3
                         >= 0
                     ):
                         self.buy_headliner(champion[1])
@@ -386,22 +391,20 @@ class Arena:
     def buy_headliner(self, champion: str) -> None:
         """Buy headliner and replace the normal one if level not equal 3"""
         if comps.COMP[champion]["level"] < 3:
-            for champ in self.board:
-                if champ.name == champion:
-                    self.remove_champion(champ)
-                    self.buy_champion([4, champion], 0)
-                    for newchamp in self.bench:
-                        if isinstance(newchamp, Champion) and newchamp.name == champion:
-                            self.move_known(newchamp)
-                    break
+            if self.model.on_board(champion):
+                self.remove_champion(self.model.board[champion])
+                self.buy_champion([4, champion], 0)
+                bought: list[int] = self.model.bench_slots(champion)
+                if bought:
+                    self.move_known(self.model.bench[bought[0]])
             else:
-                for index, slot in enumerate(self.bench):
-                    if isinstance(slot, Champion) and slot.name == champion:
-                        mk_functions.press_e(slot.coords)
-                        self.bench[index] = None
+                for index in self.model.bench_slots(champion):
+                    mk_functions.press_e(self.model.clear_bench(index).coords)
                 self.buy_champion([4, champion], 3)
         else:
             self.buy_champion([4, champion], 3)
+        # Headliners don't cost the same as the regular champion
+        self.gold.invalidate()
         self.have_headliner = True
 
     def buy_champion(self, champion, quantity) -> None:
@@ -409,6 +412,8 @@ class Arena:
         none_slot: int = arena_functions.empty_slot()
         if none_slot != -1:
             mk_functions.left_click(screen_coords.BUY_LOC[champion[0]].get_coords())
+            self.gold.spend(game_assets.champion_gold_cost(champion[1]))
+            self.perception.invalidate("bench_occupied")
             print(f"    Purchased {champion[1]}")
             self.bought_champion(champion[1], none_slot)
             if champion[1] in self.champs_to_buy:
@@ -416,35 +421,45 @@ class Arena:
         else:
             # Try to buy champ 3 when bench is full
             print(f"  Board is full but want {champion[1]}")
+            bought = waits.shop_slot_changed(champion[0])
             mk_functions.left_click(screen_coords.BUY_LOC[champion[0]].get_coords())
+            # Only goes through if it upgrades a champion, so the cost is unknown
+            self.gold.invalidate()
+            self.perception.invalidate("bench_occupied")
             game_functions.default_pos()
-            sleep(0.5)
+            waits.wait_until(bought, timeout=0.5)
             self.fix_bench_state()
             none_slot = arena_functions.empty_slot()
-            sleep(0.5)
             if none_slot != -1:
                 print(f"    Purchased {champion[1]}")
                 if champion[1] in self.champs_to_buy:
                     self.champs_to_buy[champion[1]] -= quantity
 
+    @instrumentation.timed
     def buy_xp_round(self) -> None:
         """Buys XP if gold is equals or over 4"""
-        if arena_functions.get_gold() >= 4:
+        if self.gold.sync() >= game_assets.XP_COST:
             mk_functions.buy_xp()
+            LIVE_CLIENT.invalidate()
+            self.perception.invalidate("level")
+            self.gold.spend(game_assets.XP_COST)
 
+    @instrumentation.timed
     def pick_augment(self) -> None:
         """Picks an augment from user defined augment priority list or defaults to the augment that not in AVOID list"""
-        while True:
-            sleep(1)
-            augments: list = []
-            for coords in screen_coords.AUGMENT_POS:
-                augment: str = ocr.get_text(
-                    screenxy=coords.get_coords(), scale=3, psm=7
-                )
-                augments.append(augment)
+        augments: list = []
+
+        def augments_shown() -> bool:
+            frame = screen_capture.Frame.grab()
+            augments[:] = [
+                ocr.get_text(screenxy=coords.get_coords(), scale=3, psm=7, frame=frame)
+                for coords in screen_coords.AUGMENT_POS
+            ]
+            return "" not in augments
+
+        while not waits.wait_until(augments_shown, timeout=1, poll_interval=0.25):
             print(augments)
-            if len(augments) == 3 and "" not in augments:
-                break
+        print(augments)
 
         for potential in comps.AUGMENTS:
             for augment in augments:
@@ -458,7 +473,9 @@ class Arena:
         if self.augment_roll:
             print("  Rolling for augment")
             for i in range(0, 3):
+                rolled = waits.region_changed(screen_coords.AUGMENT_POS[i].get_coords())
                 mk_functions.left_click(screen_coords.AUGMENT_ROLL[i].get_coords())
+                waits.wait_until(rolled, timeout=1)
             self.augment_roll = False
             self.pick_augment()
             return
@@ -480,9 +497,10 @@ class Arena:
                 return
         mk_functions.left_click(screen_coords.AUGMENT_LOC[0].get_coords())
 
+    @instrumentation.timed
     def check_health(self) -> None:
         """Checks if current health is below 30 and conditionally activates spam roll"""
-        health: int = arena_functions.get_health()
+        health: int = self.perception.read("health")
         if health > 0:
             print(f"  Health: {health}")
             if not self.spam_roll and health < 30:
@@ -495,12 +513,10 @@ class Arena:
         """Gets labels used to display champion name UI on window"""
         labels: list = [
             (f"{slot.name}", slot.coords)
-            for slot in self.bench
-            if isinstance(slot, Champion)
+            for slot in self.model.bench_champions()
         ]
-        for slot in self.board:
-            if isinstance(slot, Champion):
-                labels.append((f"{slot.name}", slot.coords))
+        for slot in self.model.board_champions():
+            labels.append((f"{slot.name}", slot.coords))
 
         labels.extend(
             (slot, screen_coords.BOARD_LOC[self.unknown_slots[index]].get_coords())
@@ -2,51 +2,45 @@
 Functions used by the Arena class to get game data
 """
 
-from difflib import SequenceMatcher
-import threading
-from PIL import ImageGrab
+import sys
+from time import perf_counter
+import cv2
 import numpy as np
-import requests
 import screen_coords
 import ocr
+import digit_reader
 import game_assets
+import input_executor
+import item_icons
 import mk_functions
-from vec4 import Vec4
+import screen_capture
+from live_client import LIVE_CLIENT
+from name_matcher import NameMatcher
+import shop_templates
+from screen_capture import Frame
+
+CHAMPION_MATCHER = NameMatcher(game_assets.CHAMPIONS)
+ITEM_MATCHER = NameMatcher(game_assets.ITEMS, substring=True)
 
 
 def get_level() -> int:
     """Returns the level for the tactician"""
-    try:
-        response = requests.get(
-            "https://127.0.0.1:2999/liveclientdata/allgamedata",
-            timeout=10,
-            verify=False,
-        )
-        return int(response.json()["activePlayer"]["level"])
-    except (requests.exceptions.ConnectionError, KeyError):
-        return 1
+    return int(LIVE_CLIENT.get(("activePlayer", "level"), 1))
 
 
 def get_health() -> int:
     """Returns the health for the tactician"""
-    try:
-        response = requests.get(
-            "https://127.0.0.1:2999/liveclientdata/allgamedata",
-            timeout=10,
-            verify=False,
-        )
-        return int(response.json()["activePlayer"]["championStats"]["currentHealth"])
-    except (requests.exceptions.ConnectionError, KeyError):
-        return -1
+    return int(LIVE_CLIENT.get(("activePlayer", "championStats", "currentHealth"), -1))
 
 
-def get_gold() -> int:
+def get_gold(frame: Frame | None = None) -> int:
     """Returns the gold for the tactician"""
-    gold: str = ocr.get_text(
+    gold: str = digit_reader.get_text(
         screenxy=screen_coords.GOLD_POS.get_coords(),
         scale=3,
         psm=7,
         whitelist="0123456789",
+        frame=frame,
     )
     try:
         return int(gold)
@@ -56,107 +50,129 @@ def get_gold() -> int:
 
 def valid_champ(champ: str) -> str:
     """Matches champion string to a valid champion name string and returns it"""
-    if champ in game_assets.CHAMPIONS:
-        return champ
-
-    return next(
-        (
-            champion
-            for champion in game_assets.CHAMPIONS
-            if SequenceMatcher(a=champion, b=champ).ratio() >= 0.7
-        ),
-        "",
-    )
-
-
-def get_champ(
-    screen_capture: ImageGrab.Image, name_pos: Vec4, shop_pos: int, shop_array: list
-) -> str:
-    """Returns a tuple containing the shop position and champion name"""
-    champ: str = screen_capture.crop(name_pos.get_coords())
-    champ: str = ocr.get_text_from_image(image=champ, whitelist="")
-    shop_array.append((shop_pos, valid_champ(champ)))
+    champion, ratio = CHAMPION_MATCHER.match(champ)
+    return champion if ratio >= 0.7 else ""
 
 
-def get_shop() -> list:
+def get_shop(frame: Frame | None = None) -> list:
     """Returns the list of champions in the shop"""
-    screen_capture = ImageGrab.grab(bbox=screen_coords.SHOP_POS.get_coords())
+    shop_capture: np.ndarray = screen_capture.snapshot(frame).region(screen_coords.SHOP_POS)
     shop: list = []
-    thread_list: list = []
+    unknown: list = []
     for shop_index, name_pos in enumerate(screen_coords.CHAMP_NAME_POS):
-        thread = threading.Thread(
-            target=get_champ, args=(screen_capture, name_pos, shop_index, shop)
+        image: np.ndarray = screen_capture.crop(shop_capture, name_pos.get_coords())
+        champ, confidence = shop_templates.classify(image)
+        if confidence < shop_templates.CONFIDENCE_THRESHOLD:
+            unknown.append((shop_index, image))
+        else:
+            shop.append((shop_index, champ))
+    if unknown:
+        names: list[str] = ocr.get_text_batch([image for _, image in unknown], whitelist="")
+        shop.extend(
+            (shop_index, valid_champ(champ)) for (shop_index, _), champ in zip(unknown, names)
         )
-        thread_list.append(thread)
-    for thread in thread_list:
-        thread.start()
-    for thread in thread_list:
-        thread.join()
     return sorted(shop)
 
 
-def empty_slot() -> int:
+def bench_occupancy(frame: Frame | None = None, tolerance: int = 2) -> np.ndarray:
+    """Returns a boolean vector that maps to each bench slot indicating if a health bar is showing"""
+    if frame is None:
+        input_executor.wait_idle()
+    frame = screen_capture.snapshot(frame)
+    regions: list = [frame.region(positions) for positions in screen_coords.BENCH_HEALTH_POS]
+    # Scaled coordinates can round to boxes that are a pixel apart in size
+    height: int = min(region.shape[0] for region in regions)
+    width: int = min(region.shape[1] for region in regions)
+    bench: np.ndarray = np.concatenate([region[:height, :width] for region in regions])
+    # inRange checks all three channels in one pass, NumPy broadcasting over the channel axis is far slower
+    color: np.ndarray = np.array(screen_coords.HEALTH_BAR_COLOR, dtype=np.int16)
+    health_bar: np.ndarray = cv2.inRange(bench, color - tolerance, color + tolerance)
+    return health_bar.reshape(len(regions), -1).any(axis=1)
+
+
+def empty_slot(frame: Frame | None = None) -> int:
     """Finds the first empty spot on the bench"""
-    for slot, positions in enumerate(screen_coords.BENCH_HEALTH_POS):
-        screen_capture = ImageGrab.grab(bbox=positions.get_coords())
-        screenshot_array = np.array(screen_capture)
-        if not (np.abs(screenshot_array - (0, 255, 18)) <= 3).all(axis=2).any():
-            return slot  # Slot 0-8
-    return -1  # No empty slot
+    bench_occupied: np.ndarray = bench_occupancy(frame, tolerance=3)
+    if bench_occupied.all():
+        return -1  # No empty slot
+    return int(np.argmin(bench_occupied))  # Slot 0-8
 
 
-def bench_occupied_check() -> list:
+def bench_occupied_check(frame: Frame | None = None) -> list:
     """Returns a list of booleans that map to each bench slot indicating if its occupied"""
-    bench_occupied: list = []
-    for positions in screen_coords.BENCH_HEALTH_POS:
-        screen_capture = ImageGrab.grab(bbox=positions.get_coords())
-        screenshot_array = np.array(screen_capture)
-        if not (np.abs(screenshot_array - (0, 255, 18)) <= 2).all(axis=2).any():
-            bench_occupied.append(False)
-        else:
-            bench_occupied.append(True)
-    return bench_occupied
+    return bench_occupancy(frame).tolist()
 
 
 def valid_item(item: str) -> str | None:
     """Checks if the item passed in arg one is valid"""
-    return next(
-        (
-            valid_item_name
-            for valid_item_name in game_assets.ITEMS
-            if valid_item_name in item
-            or SequenceMatcher(a=valid_item_name, b=item).ratio() >= 0.85
-        ),
-        None,
-    )
+    valid_item_name, ratio = ITEM_MATCHER.match(item)
+    return valid_item_name if ratio >= 0.85 else None
 
 
 def get_items() -> list:
     """Returns a list of items currently on the board"""
+    mk_functions.move_mouse(screen_coords.DEFAULT_LOC.get_coords())
+    frame: Frame = screen_capture.Frame.grab()
+    icons: list = item_icons.classify(
+        [frame.region(positions) for positions in screen_coords.ITEM_ICON_POS]
+    )
     item_bench: list = []
-    for positions in screen_coords.ITEM_POS:
-        mk_functions.move_mouse(positions[0].get_coords())
-        item: str = ocr.get_text(
-            screenxy=positions[1].get_coords(),
-            scale=3,
-            psm=7,
-            whitelist=ocr.ALPHABET_WHITELIST,
-        )
-        item_bench.append(valid_item(item))
+    for positions, (item, confident) in zip(screen_coords.ITEM_POS, icons):
+        if not confident:
+            # Fall back to reading the tooltip
+            mk_functions.move_mouse(positions[0].get_coords())
+            item: str = ocr.get_text(
+                screenxy=positions[1].get_coords(),
+                scale=3,
+                psm=7,
+                whitelist=ocr.ALPHABET_WHITELIST,
+            )
+            item: str | None = valid_item(item)
+        item_bench.append(item)
     mk_functions.move_mouse(screen_coords.DEFAULT_LOC.get_coords())
     return item_bench
 
 
-def check_headliner() -> bool:
+def check_headliner(frame: Frame | None = None) -> bool:
     """Check if the last Champion in the store is a headliner"""
+    frame = screen_capture.snapshot(frame)
     result: int = 0
     for index, positions in enumerate(screen_coords.HEADLINER_POS):
-        headliner: str = ocr.get_text(
+        headliner: str = digit_reader.get_text(
             screenxy=positions.get_coords(),
             scale=3,
             psm=10,
             whitelist=ocr.ROUND_WHITELIST.replace("-", ""),
+            frame=frame,
         )
         if headliner == "2":
             result += 2**index
     return result
+
+
+def bench_occupancy_per_slot(frame: Frame) -> list:
+    """Checks the bench one slot at a time like bench_occupied_check did before bench_occupancy"""
+    bench_occupied: list = []
+    for positions in screen_coords.BENCH_HEALTH_POS:
+        screenshot_array = frame.region(positions)
+        bench_occupied.append(bool((np.abs(screenshot_array - (0, 255, 18)) <= 2).all(axis=2).any()))
+    return bench_occupied
+
+
+def benchmark(calls: int = 1000) -> None:
+    """Times bench occupancy over a frame with a health bar in every other slot, vectorized and per slot"""
+    coords: tuple = screen_coords.GAME_WINDOW_POS.get_coords()
+    frame = Frame(np.zeros((coords[3] - coords[1], coords[2] - coords[0], 3), dtype=np.uint8), coords[:2])
+    for slot in range(0, len(screen_coords.BENCH_HEALTH_POS), 2):
+        region: np.ndarray = frame.region(screen_coords.BENCH_HEALTH_POS[slot])
+        region[region.shape[0] // 2, :] = screen_coords.HEALTH_BAR_COLOR
+    assert bench_occupancy(frame).tolist() == bench_occupancy_per_slot(frame)
+    for name, check in (("Vectorized", bench_occupancy), ("Per slot", bench_occupancy_per_slot)):
+        started: float = perf_counter()
+        for _ in range(calls):
+            check(frame)
+        print(f"{name}: {(perf_counter() - started) / calls * 1e6:.0f} us per bench check")
+
+
+if __name__ == "__main__":
+    benchmark(*(int(argument) for argument in sys.argv[1:]))
@@ -3,161 +3,107 @@ Handles getting into a game
 """
 
 from time import sleep
-import json
-from requests.auth import HTTPBasicAuth
-import requests
 import urllib3
 import settings
+from lcu_client import LCUClient
+
+try:
+    import lcu_events
+except ImportError:
+    lcu_events = None
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+POLL_INTERVAL: float = 1
+
 
-def create_lobby(client_info: tuple) -> bool:
+def create_lobby(client: LCUClient) -> bool:
     """Creates a lobby"""
-    payload: dict[str, int] = {"queueId": 1090}  # Ranked TFT is 1100
-    payload: dict[str, int] = json.dumps(payload)
-    try:
-        status = requests.post(
-            f"{client_info[1]}/lol-lobby/v2/lobby/",
-            payload,
-            auth=HTTPBasicAuth('riot', client_info[0]),
-            timeout=10,
-            verify=False,
-        )
-        if status.status_code == 200:
-            print("  Creating lobby")
-            return True
-        return False
-    except ConnectionError:
-        return False
-
-
-def start_queue(client_info: tuple) -> bool:
+    if client.create_lobby():
+        print("  Creating lobby")
+        return True
+    return False
+
+
+def start_queue(client: LCUClient) -> bool:
     """Starts queue"""
-    try:
-        status = requests.post(
-            f"{client_info[1]}/lol-lobby/v2/lobby/matchmaking/search",
-            auth=HTTPBasicAuth('riot', client_info[0]),
-            timeout=10,
-            verify=False,
-        )
-        if status.status_code == 204:
-            print("  Starting queue")
-            return True
-        return False
-    except ConnectionError:
-        return False
-
-
-def check_queue(client_info: tuple) -> bool:
+    if client.start_queue():
+        print("  Starting queue")
+        return True
+    return False
+
+
+def check_queue(client: LCUClient) -> bool:
     """Checks queue to see if we are searching"""
-    try:
-        status = requests.get(
-            f"{client_info[1]}/lol-lobby/v2/lobby/matchmaking/search-state",
-            auth=HTTPBasicAuth('riot', client_info[0]),
-            timeout=10,
-            verify=False,
-        )
-        return status.json()['searchState'] == 'Searching'
-    except ConnectionError:
-        return False
-
-
-def check_game_status(client_info: tuple) -> bool:
+    return client.is_searching()
+
+
+def check_game_status(client: LCUClient) -> str | bool:
     """Checks to see if we are in a game"""
-    try:
-        status = requests.get(
-            f"{client_info[1]}/lol-gameflow/v1/session",
-            auth=HTTPBasicAuth('riot', client_info[0]),
-            timeout=10,
-            verify=False,
-        )
-        return status.json().get("phase", "None")
-    except ConnectionError:
-        return False
-
-
-def accept_queue(client_info: tuple) -> bool:
+    phase: str | None = client.gameflow_phase()
+    return phase if phase is not None else False
+
+
+def accept_queue(client: LCUClient) -> bool:
     """Accepts the queue"""
-    requests.post(
-        f"{client_info[1]}/lol-matchmaking/v1/ready-check/accept",
-        auth=HTTPBasicAuth('riot', client_info[0]),
-        timeout=10,
-        verify=False,
-    )
+    return client.accept_ready_check()
 
 
-def change_arena_skin(client_info: tuple) -> bool:
+def change_arena_skin(client: LCUClient) -> bool:
     """Changes arena skin to default, other arena skins have different coordinates"""
-    try:
-        status = requests.delete(
-            f"{client_info[1]}/lol-cosmetics/v1/selection/tft-map-skin",
-            auth=HTTPBasicAuth('riot', client_info[0]),
-            timeout=10,
-            verify=False,
-        )
-        if status.status_code == 204:
-            print("  Changed arena skin to default")
-            return True
-        return False
-    except ConnectionError:
-        return False
-
-
-def get_client() -> tuple:
+    if client.reset_arena_skin():
+        print("  Changed arena skin to default")
+        return True
+    return False
+
+
+def get_client() -> LCUClient:
     """Gets data about the client such as port and auth token"""
     print("\n\n[Auto Queue]")
     file_path = settings.LEAGUE_CLIENT_PATH + "\\lockfile"
-    got_lock_file = False
-    while not got_lock_file:
+    while True:
         try:
             with open(file_path, "r", encoding="utf-8") as data:
-                data: list[str] = data.read().split(":")
-                app_port: str = data[2]
-                remoting_auth_token: str = data[3]
-                server_url: str = f"https://127.0.0.1:{app_port}"
-                got_lock_file = True
+                client = LCUClient.from_lockfile(data.read())
+                break
         except IOError:
             print("  Client not open! Trying again in 10 seconds.")
             sleep(10)
     print("  Client found")
-    return (remoting_auth_token, server_url)
+    return client
 
 
-def reconnect(client_info: tuple) -> None:
+def reconnect(client: LCUClient) -> None:
     """Reconnect to game when "Failed to Connect" windows are found"""
-    requests.post(
-        f"{client_info[1]}/lol-gameflow/v1/reconnect",
-        auth=HTTPBasicAuth('riot', client_info[0]),
-        timeout=10,
-        verify=False,
-    )
+    client.reconnect()
 
 
 def queue() -> None:
     """Function that handles getting into a game"""
-    client_info: tuple = get_client()
-    while check_game_status(client_info) == "InProgress":
+    client: LCUClient = get_client()
+    while check_game_status(client) == "InProgress":
         sleep(2)
-    if check_game_status(client_info) == "Reconnect":
+    if check_game_status(client) == "Reconnect":
         print("  Reconnecting")
-        reconnect(client_info)
+        reconnect(client)
         return
-    while not create_lobby(client_info):
+    while not create_lobby(client):
         sleep(3)
 
-    change_arena_skin(client_info)
+    change_arena_skin(client)
+
+    if lcu_events is not None and lcu_events.wait_for_game(client):
+        return
 
     sleep(3)
 
-    while state := check_game_status(client_info):
+    # False means the client didn't answer, that is retried instead of treated as the game starting
+    while (state := check_game_status(client)) != "InProgress":
         if state == "None":
-            create_lobby(client_info)
+            create_lobby(client)
         if state == "Lobby":
-            start_queue(client_info)
+            start_queue(client)
         if state == "ReadyCheck":
-            accept_queue(client_info)
+            accept_queue(client)
             print("  Accepting")
-        if state == "InProgress":
-            return
-        sleep(3)
+        sleep(POLL_INTERVAL)
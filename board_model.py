@@ -0,0 +1,179 @@
+"""
+Bench and board state indexed by slot and by champion name
+Our own actions are applied as deltas, the screen is only checked again for bench slots whose pixels changed
+"""
+
+import hashlib
+import sys
+from time import perf_counter
+import numpy as np
+from champion import Champion
+import screen_coords
+from screen_capture import Frame
+
+BENCH_SIZE: int = 9
+
+
+class BoardModel:
+    """Bench occupants by slot plus name indexes over the bench and the board"""
+
+    def __init__(self, bench_size: int = BENCH_SIZE) -> None:
+        self.bench: list = [None] * bench_size  # None, "?" / a champion name for unknowns, or a Champion
+        self.bench_names: dict[str, set[int]] = {}  # Champion name -> bench slots holding it
+        self.bench_unknown: set[int] = set()  # Bench slots holding an unknown unit
+        self.board: dict[str, Champion] = {}  # Champion name -> Champion, in the order they were placed
+        self.dirty: set[int] = set(range(bench_size))  # Slots our actions touched since the last reconcile
+        self.slot_digests: list[bytes | None] = [None] * bench_size
+
+    def check_slot(self, slot: int) -> None:
+        """Raises for slots outside of the bench, negative indexes would write a different slot than is indexed"""
+        if not 0 <= slot < len(self.bench):
+            raise IndexError(f"Bench slot {slot} is outside of 0-{len(self.bench) - 1}")
+
+    def set_bench(self, slot: int, occupant) -> None:
+        """Puts the occupant in the bench slot, replacing whatever was there"""
+        self.clear_bench(slot)
+        self.bench[slot] = occupant
+        if isinstance(occupant, Champion):
+            self.bench_names.setdefault(occupant.name, set()).add(slot)
+        elif isinstance(occupant, str):
+            self.bench_unknown.add(slot)
+        self.dirty.add(slot)
+
+    def clear_bench(self, slot: int):
+        """Empties the bench slot and returns what was in it"""
+        self.check_slot(slot)
+        occupant = self.bench[slot]
+        if isinstance(occupant, Champion):
+            slots: set[int] = self.bench_names[occupant.name]
+            slots.discard(slot)
+            if not slots:
+                del self.bench_names[occupant.name]
+        self.bench_unknown.discard(slot)
+        self.bench[slot] = None
+        self.dirty.add(slot)
+        return occupant
+
+    def clear_all(self) -> None:
+        """Empties every bench slot"""
+        for slot in range(len(self.bench)):
+            self.clear_bench(slot)
+
+    def bench_slots(self, name: str) -> list[int]:
+        """Returns the bench slots holding the champion, in slot order"""
+        return sorted(self.bench_names.get(name, ()))
+
+    def bench_champions(self) -> list[Champion]:
+        """Returns every known champion on the bench in slot order"""
+        return [slot for slot in self.bench if isinstance(slot, Champion)]
+
+    def movable_champion(self) -> Champion | None:
+        """Returns the champion in the lowest bench slot that isn't on the board yet"""
+        slots: list[int] = [
+            min(slots) for name, slots in self.bench_names.items() if name not in self.board
+        ]
+        return self.bench[min(slots)] if slots else None
+
+    def first_unknown(self) -> int:
+        """Returns the lowest bench slot holding an unknown unit, -1 if there is none"""
+        return min(self.bench_unknown, default=-1)
+
+    def on_board(self, name: str) -> bool:
+        """Returns if the champion was placed on the board"""
+        return name in self.board
+
+    def board_champions(self) -> list[Champion]:
+        """Returns the champions on the board in the order they were placed"""
+        return list(self.board.values())
+
+    def add_to_board(self, champion: Champion) -> None:
+        """Records the champion as placed on the board"""
+        self.board[champion.name] = champion
+
+    def remove_from_board(self, champion: Champion) -> None:
+        """Records the champion as gone from the board"""
+        del self.board[champion.name]
+
+    @staticmethod
+    def slot_digest(frame: Frame, slot: int) -> bytes:
+        """Returns a digest of the bench slot's health bar pixels"""
+        pixels: np.ndarray = np.ascontiguousarray(frame.region(screen_coords.BENCH_HEALTH_POS[slot]))
+        return hashlib.blake2b(pixels, digest_size=16).digest()
+
+    def changed_slots(self, frame: Frame) -> list[int]:
+        """Returns the bench slots whose pixels changed or that our actions touched since the last call"""
+        changed: set[int] = set(self.dirty)
+        for slot in range(len(self.bench)):
+            digest: bytes = self.slot_digest(frame, slot)
+            if digest != self.slot_digests[slot]:
+                self.slot_digests[slot] = digest
+                changed.add(slot)
+        self.dirty.clear()
+        return sorted(changed)
+
+    def mismatches(self, frame: Frame, bench_occupied: list) -> tuple[list[int], list[int]]:
+        """Returns the changed slots that look occupied but are empty in the model, and the reverse"""
+        appeared: list[int] = []
+        vanished: list[int] = []
+        for slot in self.changed_slots(frame):
+            if self.bench[slot] is None and bench_occupied[slot]:
+                appeared.append(slot)
+            elif self.bench[slot] is not None and not bench_occupied[slot]:
+                vanished.append(slot)
+        return appeared, vanished
+
+
+def scripted_check() -> None:
+    """Replays a scripted action sequence and checks the indexes against a full rescan after every step"""
+
+    def champion(name: str, slot: int) -> Champion:
+        return Champion(name=name, coords=(slot, 0), build=[], slot=slot, size=1, final_comp=False)
+
+    def rescan(model: BoardModel) -> Champion | None:
+        return next(
+            (slot for slot in model.bench if isinstance(slot, Champion) and slot.name not in model.board),
+            None,
+        )
+
+    model = BoardModel()
+    steps: list = [
+        lambda: model.set_bench(0, champion("Ahri", 0)),
+        lambda: model.set_bench(1, "?"),
+        lambda: model.set_bench(2, champion("Ahri", 2)),
+        lambda: model.set_bench(3, champion("Zed", 3)),
+        lambda: model.add_to_board(model.clear_bench(0)),
+        lambda: model.clear_bench(1),
+        lambda: model.set_bench(1, champion("Lux", 1)),
+        lambda: model.remove_from_board(model.board["Ahri"]),
+        lambda: model.add_to_board(model.clear_bench(3)),
+        model.clear_all,
+    ]
+    for step in steps:
+        step()
+        assert model.movable_champion() is rescan(model)
+        assert model.bench_unknown == {slot for slot, unit in enumerate(model.bench) if isinstance(unit, str)}
+        for name, slots in model.bench_names.items():
+            assert slots == {
+                slot for slot, unit in enumerate(model.bench) if isinstance(unit, Champion) and unit.name == name
+            }
+    print(f"{len(steps)} scripted steps match a full rescan")
+
+
+def benchmark(rounds: int = 10000) -> None:
+    """Times a round's worth of bench and board bookkeeping"""
+    names: list[str] = [f"Champion{index}" for index in range(BENCH_SIZE)]
+    model = BoardModel()
+    started: float = perf_counter()
+    for _ in range(rounds):
+        for slot, name in enumerate(names):
+            model.set_bench(slot, Champion(name=name, coords=(slot, 0), build=[], slot=slot, size=1, final_comp=False))
+        while (champion := model.movable_champion()) is not None:
+            model.add_to_board(model.clear_bench(champion.index))
+        for champion in model.board_champions():
+            model.remove_from_board(champion)
+    print(f"{(perf_counter() - started) / rounds * 1e6:.1f} us of state upkeep per round")
+
+
+if __name__ == "__main__":
+    scripted_check()
+    benchmark(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,159 @@
+"""
+Reads the fixed font digits of the gold, round and headliner counters without Tesseract
+Glyphs are split with connected components and matched against a glyph bank
+The bank is generated offline from labelled crops: python digit_reader.py <crops> [bank]
+Crops are named "<text>_<anything>.png", for example "2-1_0001.png"
+Reads of the same crops are timed against Tesseract with: python digit_reader.py benchmark <crops> [whitelist]
+"""
+
+import os
+import sys
+from time import perf_counter
+import cv2
+import numpy as np
+from PIL import Image
+import ocr
+import screen_capture
+from screen_capture import Frame
+
+BANK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates", "digits.npz")
+GLYPH_SIZE: tuple = (12, 16)  # (width, height) every glyph is resized to
+MIN_GLYPH_AREA: int = 4  # Smaller components are treated as noise
+CONFIDENCE_THRESHOLD: float = 0.85
+MAX_DISTANCE_RATIO: float = 0.8  # Nearest glyph has to be this much closer than the next best glyph
+
+
+def segment(image: np.ndarray) -> list[np.ndarray]:
+    """Splits the crop into glyphs ordered left to right, each resized to GLYPH_SIZE"""
+    grayscale = ocr.image_grayscale(np.ascontiguousarray(image[..., :3]))
+    text_mask: np.ndarray = (ocr.image_thresholding(grayscale) == 0).astype(np.uint8)
+    count, _, stats, _ = cv2.connectedComponentsWithStats(text_mask, connectivity=8)
+    boxes: list = sorted(
+        (stats[label] for label in range(1, count) if stats[label][cv2.CC_STAT_AREA] >= MIN_GLYPH_AREA),
+        key=lambda box: box[cv2.CC_STAT_LEFT],
+    )
+    return [
+        cv2.resize(
+            text_mask[y_pos:y_pos + height, x_pos:x_pos + width] * 255,
+            GLYPH_SIZE,
+            interpolation=cv2.INTER_AREA,
+        ).ravel() / 255
+        for x_pos, y_pos, width, height, _ in boxes
+    ]
+
+
+def load_bank(path: str = BANK_PATH) -> tuple[np.ndarray, np.ndarray] | None:
+    """Returns the glyph labels and glyphs or None if no bank has been generated"""
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as bank:
+        return bank["labels"], bank["glyphs"]
+
+
+BANK: tuple[np.ndarray, np.ndarray] | None = load_bank()
+
+
+def read(image: np.ndarray, whitelist: str) -> tuple[str, float]:
+    """Returns the text and the confidence of the least certain glyph, 0 if any glyph is ambiguous"""
+    if BANK is None:
+        return "", 0.0
+    labels, glyphs = BANK
+    allowed: np.ndarray = np.isin(labels, list(whitelist))
+    if not allowed.any():
+        return "", 0.0
+    labels, glyphs = labels[allowed], glyphs[allowed]
+    segments: list[np.ndarray] = segment(image)
+    if not segments:
+        return "", 0.0
+    distances: np.ndarray = np.abs(np.array(segments)[:, None, :] - glyphs[None, :, :]).mean(axis=2)
+    best: np.ndarray = distances.argmin(axis=1)
+    text: str = "".join(labels[best])
+    if len(labels) > 1:
+        # The bank holds one glyph per label, so the runner-up is the second nearest glyph
+        nearest, runner_up = np.partition(distances, 1, axis=1)[:, :2].T
+        if (nearest > runner_up * MAX_DISTANCE_RATIO).any():
+            return text, 0.0
+    return text, float(1 - distances[np.arange(len(best)), best].max())
+
+
+def get_text(screenxy: tuple, scale: int, psm: int, whitelist: str, frame: Frame | None = None) -> str:
+    """Returns digits from screen coordinates, falls back to Tesseract when the glyphs aren't certain"""
+    image: np.ndarray = screen_capture.grab(screenxy) if frame is None else frame.crop(screenxy)
+    return get_text_from_image(image, whitelist, scale, psm)
+
+
+def get_text_from_image(image: np.ndarray, whitelist: str, scale: int = 3, psm: int = 7) -> str:
+    """Takes an image and returns the digits, falls back to Tesseract when the glyphs aren't certain"""
+    text, confidence = read(image, whitelist)
+    if confidence >= CONFIDENCE_THRESHOLD:
+        return text
+    return ocr.read_image(image, scale, psm, whitelist)
+
+
+def build_bank(directory: str, path: str = BANK_PATH) -> int:
+    """Averages the glyphs of every labelled crop whose glyph count matches its label"""
+    samples: dict[str, list[np.ndarray]] = {}
+    for file in sorted(os.listdir(directory)):
+        if not file.endswith(".png"):
+            continue
+        label: str = file.split("_")[0]
+        segments: list[np.ndarray] = segment(np.asarray(Image.open(os.path.join(directory, file))))
+        if len(segments) != len(label):
+            print(f"  Skipping {file}, found {len(segments)} glyphs for {label}")
+            continue
+        for character, glyph in zip(label, segments):
+            samples.setdefault(character, []).append(glyph)
+    labels: list[str] = sorted(samples)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez(
+        path,
+        labels=np.array(labels),
+        glyphs=np.array([np.mean(samples[label], axis=0) for label in labels]),
+    )
+    return len(labels)
+
+
+def benchmark(directory: str, whitelist: str = ocr.ROUND_WHITELIST) -> None:
+    """Times the glyph reader and Tesseract on every labelled crop and prints how often each was right"""
+    crops: list[tuple[str, np.ndarray]] = [
+        (file.split("_")[0], np.asarray(Image.open(os.path.join(directory, file))))
+        for file in sorted(os.listdir(directory))
+        if file.endswith(".png")
+    ]
+    glyph_time: float = 0.0
+    tesseract_time: float = 0.0
+    confident: int = 0
+    glyph_correct: int = 0
+    tesseract_correct: int = 0
+    combined_correct: int = 0
+    for label, image in crops:
+        started: float = perf_counter()
+        text, confidence = read(image, whitelist)
+        glyph_time += perf_counter() - started
+        started = perf_counter()
+        # Bypasses the OCR cache so every crop is timed as a fresh read
+        tesseract_text: str = ocr.recognize(ocr.preprocess(image, 3), 7, whitelist)
+        tesseract_time += perf_counter() - started
+        if confidence >= CONFIDENCE_THRESHOLD:
+            confident += 1
+            glyph_correct += text == label
+            combined_correct += text == label
+        else:
+            combined_correct += tesseract_text == label
+        tesseract_correct += tesseract_text == label
+    if not crops:
+        print("No labelled crops found")
+        return
+    print(
+        f"Glyphs: {glyph_time / len(crops) * 1e6:.0f} us per read,"
+        f" {confident}/{len(crops)} confident, {glyph_correct}/{confident} of those correct"
+    )
+    print(f"Tesseract: {tesseract_time / len(crops) * 1e6:.0f} us per read, {tesseract_correct}/{len(crops)} correct")
+    print(f"Glyphs with Tesseract fallback: {combined_correct}/{len(crops)} correct")
+
+
+if __name__ == "__main__":
+    if sys.argv[1] == "benchmark":
+        benchmark(*sys.argv[2:4])
+    else:
+        print(f"Saved {build_bank(*sys.argv[1:3])} glyphs")
@@ -11,7 +11,10 @@ import settings
 import arena_functions
 import game_assets
 import game_functions
+import instrumentation
 from arena import Arena
+from perception import GameState, PerceptionScheduler
+from round_watcher import RoundWatcher
 from vec4 import Vec4
 from vec2 import Vec2
 
@@ -19,9 +22,12 @@ from vec2 import Vec2
 class Game:
     """Game class that handles game logic such as round tasks"""
 
+    # pylint: disable=too-many-instance-attributes
     def __init__(self, message_queue: multiprocessing.Queue) -> None:
         self.message_queue = message_queue
-        self.arena = Arena(self.message_queue)
+        self.perception = PerceptionScheduler()
+        self.arena = Arena(self.message_queue, self.perception)
+        self.round_watcher = RoundWatcher()
         self.round = "0-0"
         self.time: None = None
         self.forfeit_time: int = settings.FORFEIT_TIME + random.randint(50, 150)
@@ -65,7 +71,11 @@ class Game:
                 return
             sleep(1)
         self.start_time: float = perf_counter()
-        self.game_loop()
+        self.round_watcher.start()
+        try:
+            self.game_loop()
+        finally:
+            self.round_watcher.stop()
 
     def check_failed_to_connect_window(self) -> bool:
         """Check "Failed to Connect" windows and try to reconnect"""
@@ -89,7 +99,8 @@ class Game:
         last_game_health: int = 100
 
         while True:
-            game_health: int = arena_functions.get_health()
+            state: GameState = self.perception.tick(("health",))
+            game_health: int = state.health
             if game_health == 0 and last_game_health > 0:
                 count: int = 15
                 while count > 0:
@@ -105,7 +116,7 @@ class Game:
                 break
             last_game_health = game_health
 
-            self.round: str = game_functions.get_round()
+            self.round: str = self.round_watcher.round
 
             if (
                 settings.FORFEIT
@@ -115,22 +126,29 @@ class Game:
                 return
 
             if self.round != ran_round:
-                if self.round in game_assets.PVP_ROUND:
-                    game_functions.default_pos()
-                    self.pvp_round()
-                    ran_round: str = self.round
-                elif self.round in game_assets.PVE_ROUND:
-                    game_functions.default_pos()
-                    self.pve_round()
-                    ran_round: str = self.round
-                elif self.round in game_assets.CAROUSEL_ROUND:
-                    self.carousel_round()
-                    ran_round: str = self.round
-                elif self.round in game_assets.SECOND_ROUND:
-                    self.second_round()
-                    ran_round: str = self.round
-            sleep(0.5)
-
+                # Gold, level, shop and bench all change between rounds
+                self.perception.invalidate()
+                self.arena.gold.invalidate()
+            if self.round != ran_round and self.round in game_assets.ROUNDS:
+                with instrumentation.round_span(self.round):
+                    if self.round in game_assets.PVP_ROUND:
+                        game_functions.default_pos()
+                        self.pvp_round()
+                        ran_round: str = self.round
+                    elif self.round in game_assets.PVE_ROUND:
+                        game_functions.default_pos()
+                        self.pve_round()
+                        ran_round: str = self.round
+                    elif self.round in game_assets.CAROUSEL_ROUND:
+                        self.carousel_round()
+                        ran_round: str = self.round
+                    elif self.round in game_assets.SECOND_ROUND:
+                        self.second_round()
+                        ran_round: str = self.round
+            # Wakes up as soon as the watcher reads a new round
+            self.round_watcher.wait_for_change(self.perception.next_refresh(("health",)))
+
+    @instrumentation.timed
     def second_round(self) -> None:
         """Move unknown champion to board after first carousel"""
         print(f"\n[Second Round] {self.round}")
@@ -139,10 +157,11 @@ class Game:
             result = arena_functions.bench_occupied_check()
             if any(result):
                 break
-        self.arena.bench[result.index(True)] = "?"
+        self.arena.model.set_bench(result.index(True), "?")
         self.arena.move_unknown()
         self.end_round_tasks()
 
+    @instrumentation.timed
     def carousel_round(self) -> None:
         """Handles tasks for carousel rounds"""
         print(f"\n[Carousel Round] {self.round}")
@@ -153,6 +172,7 @@ class Game:
         print("  Getting a champ from the carousel")
         game_functions.get_champ_carousel(self.round)
 
+    @instrumentation.timed
     def pve_round(self) -> None:
         """Handles tasks for PVE rounds"""
         print(f"\n[PvE Round] {self.round}")
@@ -182,6 +202,7 @@ class Game:
         self.arena.bench_cleanup()
         self.end_round_tasks()
 
+    @instrumentation.timed
     def pvp_round(self) -> None:
         """Handles tasks for PVP rounds"""
         print(f"\n[PvP Round] {self.round}")
@@ -217,6 +238,7 @@ class Game:
             self.arena.place_items()
         self.end_round_tasks()
 
+    @instrumentation.timed
     def end_round_tasks(self) -> None:
         """Common tasks across rounds that happen at the end"""
         self.arena.check_health()
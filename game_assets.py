@@ -2,6 +2,8 @@
 Contains static item & champion data
 """
 
+from time import perf_counter
+
 BASIC_ITEM: set[str] = {"BFSword","ChainVest","GiantsBelt","NeedlesslyLargeRod",
                             "NegatronCloak","RecurveBow","SparringGloves","Spatula",
                             "TearoftheGoddess"}
@@ -130,6 +132,10 @@ ITEM_PLACEMENT_ROUNDS: set[str] = {"2-2", "3-2", "4-2", "5-2",
 
 FINAL_COMP_ROUND = "4-5"
 
+REROLL_COST = 2
+
+XP_COST = 4
+
 FULL_ITEMS = {"8bitEmblem":("Spatula","RecurveBow"),
                 "EmoEmblem":("Spatula","TearoftheGoddess"),
                 "HEARTSTEELEmblem":("Spatula","GiantsBelt"),
@@ -137,16 +143,16 @@ FULL_ITEMS = {"8bitEmblem":("Spatula","RecurveBow"),
                 "KDAEmblem":("Spatula","NeedlesslyLargeRod"),
                 "PentakillEmblem":("Spatula","ChainVest"),
                 "PunkEmblem":("Spatula","SparringGloves"),
-                "TrueDamageEmblem":("Spatula","SparringGloves"),
-                "AdaptiveHelm":("NegatronCloak","B.F.Sword"),
+                "TrueDamageEmblem":("Spatula","BFSword"),
+                "AdaptiveHelm":("NegatronCloak","TearoftheGoddess"),
                 "ArchangelsStaff":("NeedlesslyLargeRod","TearoftheGoddess"),
-                "Bloodthirster":("B.F.Sword","NegatronCloak"),
+                "Bloodthirster":("BFSword","NegatronCloak"),
                 "BlueBuff":("TearoftheGoddess","TearoftheGoddess"),
                 "BrambleVest":("ChainVest","ChainVest"),
                 "Crownguard":("ChainVest","NeedlesslyLargeRod"),
-                "Deathblade":("B.F.Sword","B.F.Sword"),
+                "Deathblade":("BFSword","BFSword"),
                 "DragonsClaw":("NegatronCloak","NegatronCloak"),
-                "EdgeofNight":("B.F.Sword","ChainVest"),
+                "EdgeofNight":("BFSword","ChainVest"),
                 "Evenshroud":("GiantsBelt","NegatronCloak"),
                 "GargoyleStoneplate":("ChainVest","NegatronCloak"),
                 "GiantSlayer":("BFSword","RecurveBow"),
@@ -169,18 +175,74 @@ FULL_ITEMS = {"8bitEmblem":("Spatula","RecurveBow"),
                 "SpearofShojin":("BFSword","TearoftheGoddess"),
                 "StatikkShiv":("RecurveBow","TearoftheGoddess"),
                 "SteadfastHeart":("ChainVest","SparringGloves"),
-                "SteraksGage":("B.F.Sword","GiantsBelt"),
+                "SteraksGage":("BFSword","GiantsBelt"),
                 "SunfireCape":("ChainVest","GiantsBelt"),
                 "TacticiansCrown":("Spatula","Spatula"),
                 "ThiefsGloves":("SparringGloves","SparringGloves"),
                 "TitansResolve":("ChainVest","RecurveBow"),
                 "WarmogsArmor":("GiantsBelt","GiantsBelt")}
 
+# Flat champion columns so hot lookups skip the nested CHAMPIONS dicts
+CHAMPION_COST: dict[str, int] = {name: champion["Gold"] for name, champion in CHAMPIONS.items()}
+CHAMPION_SIZE: dict[str, int] = {name: champion["Board Size"] for name, champion in CHAMPIONS.items()}
+
+
+def validate_recipes() -> dict[str, set[str]]:
+    """Checks every recipe against the item sets and returns the component -> combined items index"""
+    component_items: dict[str, set[str]] = {component: set() for component in BASIC_ITEM}
+    recipes: dict[tuple, str] = {}
+    for full_item, components in FULL_ITEMS.items():
+        if full_item not in COMBINED_ITEMS:
+            raise ValueError(f"Recipe for {full_item} which isn't a combined item")
+        pair: tuple = tuple(sorted(components))
+        if pair in recipes:
+            raise ValueError(f"{full_item} and {recipes[pair]} are both built from {pair[0]} and {pair[1]}")
+        recipes[pair] = full_item
+        for component in components:
+            if component not in BASIC_ITEM:
+                raise ValueError(f"Recipe for {full_item} uses unknown component {component}")
+            component_items[component].add(full_item)
+    return component_items
+
+
+# Component -> every combined item it builds into
+COMPONENT_ITEMS: dict[str, set[str]] = validate_recipes()
+
+
 def champion_board_size(champion: str) -> int:
     """Takes a string (champion name) and returns board size of champion"""
-    return CHAMPIONS[champion]["Board Size"]
+    return CHAMPION_SIZE[champion]
 
 
 def champion_gold_cost(champion: str) -> int:
     """Takes a string (champion name) and returns gold of champion"""
-    return CHAMPIONS[champion]["Gold"]
+    return CHAMPION_COST[champion]
+
+
+def other_component(item: str, component: str) -> str | None:
+    """Returns the component still missing from the item if the component is part of its recipe"""
+    first, second = FULL_ITEMS[item]
+    if first == component:
+        return second
+    return first if second == component else None
+
+
+def benchmark(calls: int = 1_000_000) -> None:
+    """Times the flat champion lookups against the nested dict lookups they replace"""
+
+    def nested_gold_cost(champion: str) -> int:
+        return CHAMPIONS[champion]["Gold"]
+
+    cases: list[tuple] = [
+        ("champion_gold_cost", champion_gold_cost, ("Ahri",)),
+        ("CHAMPIONS nested dict", nested_gold_cost, ("Ahri",)),
+        ("other_component", other_component, ("InfinityEdge", "SparringGloves")),
+    ]
+    for name, function, arguments in cases:
+        started: float = perf_counter()
+        for _ in range(calls):
+            function(*arguments)
+        print(f"{name:<24}{(perf_counter() - started) / calls * 1e9:6.0f} ns")
+
+if __name__ == "__main__":
+    benchmark()
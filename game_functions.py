@@ -3,54 +3,69 @@ Functions used by the Game class to retrieve relevant data
 """
 
 from time import sleep
-from PIL import ImageGrab
+import numpy as np
 import screen_coords
 import ocr
+import digit_reader
 import game_assets
+import instrumentation
 import mk_functions
+import screen_capture
+import waits
+from screen_capture import Frame
 
 
-def get_round() -> str:
+def get_round(frame: Frame | None = None) -> str:
     """Gets the current game round"""
-    screen_capture = ImageGrab.grab(bbox=screen_coords.ROUND_POS.get_coords())
-    round_two = screen_capture.crop(screen_coords.ROUND_POS_TWO.get_coords())
-    game_round: str = ocr.get_text_from_image(image=round_two, whitelist=ocr.ROUND_WHITELIST)
+    return read_round(screen_capture.snapshot(frame).region(screen_coords.ROUND_POS))
+
+
+def read_round(round_capture: np.ndarray) -> str:
+    """Reads the game round from the pixels of ROUND_POS"""
+    round_two = screen_capture.crop(round_capture, screen_coords.ROUND_POS_TWO.get_coords())
+    game_round: str = digit_reader.get_text_from_image(image=round_two, whitelist=ocr.ROUND_WHITELIST)
     if game_round in game_assets.ROUNDS:
         return game_round
 
-    round_one = screen_capture.crop(screen_coords.ROUND_POS_ONE.get_coords())
-    game_round: str = ocr.get_text_from_image(image=round_one, whitelist=ocr.ROUND_WHITELIST)
+    round_one = screen_capture.crop(round_capture, screen_coords.ROUND_POS_ONE.get_coords())
+    game_round: str = digit_reader.get_text_from_image(image=round_one, whitelist=ocr.ROUND_WHITELIST)
     return game_round
 
 
+@instrumentation.timed
 def pickup_items() -> None:  # Refacor this function to make it more clear whats happening
     """Picks up items from the board after PVP round"""
     for index, coords in enumerate(screen_coords.ITEM_PICKUP_LOC):
+        picked_up = waits.loot_collected()
         mk_functions.right_click(coords.get_coords())
-        if index == 7:  # Don't need to sleep on final click
+        if index == 7:  # Don't need to wait on final click
             return
         if index == 0:
-            sleep(1.2)
-        if index % 2 == 0:
-            sleep(2)
+            timeout: float = 3.2
+        elif index % 2 == 0:
+            timeout: float = 2
         else:
-            sleep(1.2)
+            timeout: float = 1.2
+        waits.wait_until(picked_up, timeout=timeout)
 
 
+@instrumentation.timed
 def get_champ_carousel(tft_round: str) -> None:
     """Gets a champion from the carousel"""
     while tft_round == get_round():
+        round_changed = waits.round_label_changed()
         mk_functions.right_click(screen_coords.CAROUSEL_LOC.get_coords())
-        sleep(0.7)
+        waits.wait_until(round_changed, timeout=0.7)
 
 
-def check_alive() -> bool:    # Refactor this function to use API
+def check_alive(frame: Frame | None = None) -> bool:    # Refactor this function to use API
     """Checks the screen to see if player is still alive"""
-    if ocr.get_text(screenxy=screen_coords.EXIT_NOW_POS.get_coords(), scale=3, psm=7) == 'EXIT NOW':
+    frame = screen_capture.snapshot(frame)
+    if ocr.get_text(screenxy=screen_coords.EXIT_NOW_POS.get_coords(), scale=3, psm=7, frame=frame) == 'EXIT NOW':
         return False
     return (
         ocr.get_text(
-            screenxy=screen_coords.VICTORY_POS.get_coords(), scale=3, psm=7
+            screenxy=screen_coords.VICTORY_POS.get_coords(), scale=3, psm=7, frame=frame
         )
         != 'CONTINUE'
     )
@@ -0,0 +1,53 @@
+"""
+Tracks the tactician's gold from our own purchases so it only has to be read with OCR occasionally
+"""
+
+import instrumentation
+from perception import PerceptionScheduler
+
+
+class GoldTracker:
+    """Predicts gold after every purchase, reroll and XP buy and re-reads it only when unsure"""
+
+    def __init__(self, perception: PerceptionScheduler) -> None:
+        self.perception: PerceptionScheduler = perception
+        self.gold: int | None = None  # None until read, or after an action with an unknown cost
+        self.verified: bool = False  # If the gold was read since the last predicted spend
+        self.ocr_reads: int = 0
+        instrumentation.track_total("gold_ocr_reads", lambda: self.ocr_reads)
+
+    def sync(self) -> int:
+        """Reads the gold from the screen and uses it as the new prediction"""
+        self.gold = self.perception.refresh("gold")
+        self.verified = True
+        self.ocr_reads += 1
+        return self.gold
+
+    def invalidate(self) -> None:
+        """Forgets the prediction, used at round boundaries and after actions with an unknown cost"""
+        self.gold = None
+
+    def current(self) -> int:
+        """Returns the predicted gold, reading it from the screen when there is no prediction"""
+        return self.gold if self.gold is not None else self.sync()
+
+    def at_least(self, amount: int) -> bool:
+        """Returns if there is at least amount gold, a prediction below it is checked on screen first
+
+        A click that didn't register still had its cost subtracted, so a low prediction can be wrong
+        """
+        if self.current() >= amount:
+            return True
+        return not self.verified and self.sync() >= amount
+
+    def spend(self, amount: int) -> None:
+        """Subtracts the cost of an action, a prediction below zero means it went wrong so gold is re-read"""
+        if self.gold is None:
+            return
+        self.gold -= amount
+        self.verified = False
+        if self.gold < 0:
+            print(f"  Gold prediction went below zero ({self.gold}), reading gold again")
+            self.sync()
+            return
+        self.perception.state.gold = self.gold
@@ -0,0 +1,303 @@
+"""
+Runs queued input plans on a background thread so perception can keep working while clicks go out
+The OS input calls go through a pluggable sink so plans can be recorded instead of sent to the game
+"""
+
+from dataclasses import dataclass
+from time import perf_counter, sleep
+from typing import Callable
+import queue
+import random
+import sys
+import threading
+import instrumentation
+import waits
+
+try:
+    import pydirectinput
+except ImportError:
+    pydirectinput = None
+
+MOVE: str = "move"
+CLICK: str = "click"
+PRESS: str = "press"
+
+
+@dataclass
+class InputTiming:
+    """Seconds to pause after each input primitive"""
+
+    move: float = 0.0
+    down: float = 0.0
+    up: float = 0.0
+    key: float = 0.0
+
+
+@dataclass
+class InputCommand:
+    """A single input step, optionally followed by waiting for the game to confirm it"""
+
+    action: str
+    coords: tuple | None = None
+    button: str = "left"
+    key: str = ""
+    jitter: bool = True
+    until: Callable[[], bool] | None = None
+    timeout: float = 0.5
+
+
+def move(coords: tuple) -> InputCommand:
+    """Moves the mouse to the coordinates"""
+    return InputCommand(MOVE, coords, jitter=False)
+
+
+def click(
+    coords: tuple,
+    button: str = "left",
+    until: Callable[[], bool] | None = None,
+    timeout: float = 0.5,
+) -> InputCommand:
+    """Clicks at the coordinates with the button"""
+    return InputCommand(CLICK, coords, button=button, until=until, timeout=timeout)
+
+
+def press(
+    key: str,
+    coords: tuple | None = None,
+    until: Callable[[], bool] | None = None,
+    timeout: float = 0.5,
+) -> InputCommand:
+    """Presses the key, at the coordinates if they are passed"""
+    return InputCommand(PRESS, coords, key=key, until=until, timeout=timeout)
+
+
+class InputSink:
+    """Interface for whatever delivers input events to the OS"""
+
+    def move_to(self, x_pos: int, y_pos: int) -> None:
+        """Moves the mouse to the screen position"""
+        raise NotImplementedError
+
+    def mouse_down(self, button: str) -> None:
+        """Holds the mouse button down"""
+        raise NotImplementedError
+
+    def mouse_up(self, button: str) -> None:
+        """Releases the mouse button"""
+        raise NotImplementedError
+
+    def press(self, key: str) -> None:
+        """Presses and releases the key"""
+        raise NotImplementedError
+
+
+class PyDirectInputSink(InputSink):
+    """Sends input to the game through DirectInput scan codes"""
+
+    def __init__(self) -> None:
+        if pydirectinput is None:
+            raise ImportError("pydirectinput is not installed")
+        # Pacing comes from the executor's InputTiming instead of a pause after every call
+        pydirectinput.PAUSE = 0
+
+    def move_to(self, x_pos: int, y_pos: int) -> None:
+        pydirectinput.moveTo(x_pos, y_pos)
+
+    def mouse_down(self, button: str) -> None:
+        pydirectinput.mouseDown(button=button)
+
+    def mouse_up(self, button: str) -> None:
+        pydirectinput.mouseUp(button=button)
+
+    def press(self, key: str) -> None:
+        pydirectinput.press(key)
+
+
+class RecordingSink(InputSink):
+    """Keeps every input event with its perf_counter time instead of sending it"""
+
+    def __init__(self) -> None:
+        self.events: list[tuple] = []
+
+    def move_to(self, x_pos: int, y_pos: int) -> None:
+        self.events.append((perf_counter(), "move_to", x_pos, y_pos))
+
+    def mouse_down(self, button: str) -> None:
+        self.events.append((perf_counter(), "mouse_down", button))
+
+    def mouse_up(self, button: str) -> None:
+        self.events.append((perf_counter(), "mouse_up", button))
+
+    def press(self, key: str) -> None:
+        self.events.append((perf_counter(), "press", key))
+
+
+class InputPlan:
+    """Commands that run back to back on the executor thread"""
+
+    # pylint: disable=too-few-public-methods
+    def __init__(self, commands: list[InputCommand], detached: bool = True) -> None:
+        self.commands: list[InputCommand] = commands
+        self.detached: bool = detached  # Nobody waits on the plan, so a failure is raised by the next wait
+        self.span: instrumentation.Span | None = instrumentation.current_span()
+        self.done = threading.Event()
+        self.confirmed: list[bool] = []
+        self.error: Exception | None = None
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Blocks until the plan ran, returns False if it didn't finish within the timeout"""
+        return self.done.wait(timeout)
+
+
+class InputExecutor:
+    """Runs submitted plans in order on one background thread"""
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, sink: InputSink | None = None, timing: InputTiming | None = None) -> None:
+        self.sink: InputSink | None = sink
+        self.timing: InputTiming = timing or InputTiming()
+        self.plans: queue.Queue = queue.Queue()
+        self.idle = threading.Event()
+        self.idle.set()
+        self.pending: int = 0
+        self.lock = threading.Lock()
+        self.commands_run: int = 0
+        self.busy_time: float = 0.0
+        self.error: Exception | None = None  # First failure of a detached plan that wasn't raised yet
+        self.thread: threading.Thread | None = None
+
+    def submit(self, commands: list[InputCommand], detached: bool = True) -> InputPlan:
+        """Queues the commands and returns right away"""
+        plan = InputPlan(commands, detached)
+        # Counted here since spans only see counters from the thread that opened them
+        instrumentation.count("input", len(commands))
+        with self.lock:
+            self.pending += 1
+            self.idle.clear()
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="InputExecutor", daemon=True)
+                self.thread.start()
+        self.plans.put(plan)
+        return plan
+
+    def execute(self, commands: list[InputCommand]) -> InputPlan:
+        """Queues the commands and blocks until they ran"""
+        self.raise_error()
+        plan: InputPlan = self.submit(commands, detached=False)
+        plan.wait()
+        if plan.error is not None:
+            raise plan.error
+        return plan
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Blocks until every queued plan ran so the screen reflects them"""
+        if threading.current_thread() is self.thread:
+            return True
+        idle: bool = self.idle.wait(timeout)
+        self.raise_error()
+        return idle
+
+    def raise_error(self) -> None:
+        """Raises the failure of a detached plan so it doesn't go unnoticed"""
+        with self.lock:
+            error, self.error = self.error, None
+        if error is not None:
+            raise error
+
+    def run(self) -> None:
+        """Runs plans as they are submitted"""
+        while True:
+            plan: InputPlan = self.plans.get()
+            started: float = perf_counter()
+            try:
+                plan.confirmed = [self.run_command(command) for command in plan.commands]
+            except Exception as error:  # pylint: disable=broad-except
+                # Keep the thread alive for later plans, the caller waiting on this one re-raises
+                plan.error = error
+                print(f"  [!] Input plan failed: {error!r}")
+                if plan.detached:
+                    with self.lock:
+                        self.error = self.error or error
+            finally:
+                elapsed: float = perf_counter() - started
+                self.busy_time += elapsed
+                if plan.span is not None:
+                    plan.span.add("input_ms", round(elapsed * 1000))
+                plan.done.set()
+                with self.lock:
+                    self.pending -= 1
+                    if self.pending == 0:
+                        self.idle.set()
+
+    def run_command(self, command: InputCommand) -> bool:
+        """Sends one command to the sink, returns whether its post condition held"""
+        if self.sink is None:
+            self.sink = PyDirectInputSink()
+        timing: InputTiming = self.timing
+        if command.coords is not None:
+            offset: int = random.randint(-3, 3) if command.jitter else 0
+            self.sink.move_to(command.coords[0] - offset, command.coords[1] - offset)
+            sleep(timing.move)
+        if command.action == CLICK:
+            self.sink.mouse_down(command.button)
+            sleep(timing.down)
+            self.sink.mouse_up(command.button)
+            sleep(timing.up)
+        elif command.action == PRESS:
+            self.sink.press(command.key)
+            sleep(timing.key)
+        self.commands_run += 1
+        if command.until is None:
+            return True
+        return waits.wait_until(command.until, command.timeout)
+
+    def throughput(self) -> float:
+        """Returns commands run per second of time spent running them"""
+        return self.commands_run / self.busy_time if self.busy_time else 0.0
+
+
+EXECUTOR = InputExecutor()
+
+
+def set_sink(sink: InputSink) -> None:
+    """Replaces the sink used for every input"""
+    EXECUTOR.sink = sink
+
+
+def set_timing(timing: InputTiming) -> None:
+    """Replaces the pauses used after every input primitive"""
+    EXECUTOR.timing = timing
+
+
+def submit(commands: list[InputCommand]) -> InputPlan:
+    """Queues the commands on the shared executor"""
+    return EXECUTOR.submit(commands)
+
+
+def execute(commands: list[InputCommand]) -> InputPlan:
+    """Runs the commands on the shared executor and waits for them"""
+    return EXECUTOR.execute(commands)
+
+
+def wait_idle(timeout: float | None = None) -> bool:
+    """Waits until the shared executor sent everything queued so far"""
+    return EXECUTOR.wait_idle(timeout)
+
+
+def benchmark(plans: int = 200, commands: int = 9) -> None:
+    """Measures how fast plans of clicks go through the executor into a recording sink"""
+    executor = InputExecutor(RecordingSink())
+    started: float = perf_counter()
+    for _ in range(plans):
+        executor.submit([click((960, 540)) for _ in range(commands)])
+    executor.wait_idle()
+    elapsed: float = perf_counter() - started
+    print(f"{plans * commands} commands in {elapsed * 1000:.1f} ms")
+    print(
+        f"{plans * commands / elapsed:.0f} commands/s submitted,"
+        f" {executor.throughput():.0f} commands/s on the executor"
+    )
+
+
+if __name__ == "__main__":
+    benchmark(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,174 @@
+"""
+Low overhead timing of every round phase
+Spans nest, count OCR calls, screen grabs, HTTP calls and input events, and every round is written
+as one JSON line to a rotating log together with how much every registered running total grew
+Print p50 / p95 per phase and the mean of every counter per round with: python instrumentation.py [log]
+"""
+
+from contextlib import contextmanager
+from functools import wraps
+from logging.handlers import RotatingFileHandler
+from time import perf_counter_ns, time
+from typing import Callable, Iterator
+import glob
+import json
+import logging
+import math
+import os
+import sys
+import threading
+
+LOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs", "rounds.jsonl")
+LOG_MAX_BYTES: int = 5 * 1024 * 1024
+LOG_BACKUPS: int = 5
+
+_local = threading.local()
+
+# Running totals kept by long lived objects such as caches and clients, keyed by counter name
+_totals: dict[str, Callable[[], int]] = {}
+
+
+class Span:
+    """Timed section of a round with its own counters and nested spans"""
+
+    __slots__ = ("name", "start_ns", "duration_ns", "counts", "children")
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.start_ns: int = perf_counter_ns()
+        self.duration_ns: int = 0
+        self.counts: dict[str, int] = {}
+        self.children: list[Span] = []
+
+    def add(self, counter: str, amount: int = 1) -> None:
+        """Adds to one of this span's counters"""
+        self.counts[counter] = self.counts.get(counter, 0) + amount
+
+    def total_counts(self) -> dict[str, int]:
+        """Returns the counters of this span including every nested span"""
+        totals: dict[str, int] = dict(self.counts)
+        for child in self.children:
+            for counter, amount in child.total_counts().items():
+                totals[counter] = totals.get(counter, 0) + amount
+        return totals
+
+    def to_dict(self) -> dict:
+        """Returns the span as a JSON serializable dict"""
+        return {
+            "name": self.name,
+            "ms": round(self.duration_ns / 1e6, 3),
+            "counts": self.total_counts(),
+            "spans": [child.to_dict() for child in self.children],
+        }
+
+
+def _stack() -> list[Span]:
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+@contextmanager
+def span(name: str) -> Iterator[Span]:
+    """Times the block as a span nested in the current one"""
+    stack: list[Span] = _stack()
+    current = Span(name)
+    if stack:
+        stack[-1].children.append(current)
+    stack.append(current)
+    try:
+        yield current
+    finally:
+        current.duration_ns = perf_counter_ns() - current.start_ns
+        stack.pop()
+
+
+def timed(function: Callable) -> Callable:
+    """Decorator that times every call of the function as a span named after it"""
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        with span(function.__qualname__):
+            return function(*args, **kwargs)
+    return wrapper
+
+
+def count(counter: str, amount: int = 1) -> None:
+    """Adds to a counter ("ocr", "grab", "http", "input") of the span running on this thread"""
+    stack: list[Span] = _stack()
+    if stack:
+        stack[-1].add(counter, amount)
+
+
+def track_total(counter: str, read: Callable[[], int]) -> None:
+    """Registers a running total, every round records how much it grew as one of its counters"""
+    _totals[counter] = read
+
+
+def current_span() -> Span | None:
+    """Returns the span running on this thread so work handed to another thread can count into it"""
+    stack: list[Span] = _stack()
+    return stack[-1] if stack else None
+
+
+def get_logger() -> logging.Logger:
+    """Returns the rotating JSON lines logger, the log file is only created once a round is written"""
+    logger: logging.Logger = logging.getLogger("rounds")
+    if not logger.handlers:
+        os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        handler = RotatingFileHandler(LOG_PATH, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+    return logger
+
+
+@contextmanager
+def round_span(game_round: str) -> Iterator[Span]:
+    """Times a whole round and writes it as one JSON line when it ends"""
+    started: float = time()
+    before: dict[str, int] = {counter: read() for counter, read in _totals.items()}
+    with span(game_round) as current:
+        yield current
+    for counter, read in _totals.items():
+        current.add(counter, read() - before.get(counter, 0))
+    get_logger().info(json.dumps({"round": game_round, "time": started, **current.to_dict()}))
+
+
+def phase_durations(spans: list[dict], prefix: str = "") -> Iterator[tuple[str, float]]:
+    """Yields (phase path, milliseconds) for every nested span"""
+    for child in spans:
+        path: str = f"{prefix}/{child['name']}" if prefix else child["name"]
+        yield path, child["ms"]
+        yield from phase_durations(child["spans"], path)
+
+
+def percentile(values: list[float], share: float) -> float:
+    """Returns the nearest rank percentile of the sorted values"""
+    return values[max(0, math.ceil(share * len(values)) - 1)]
+
+
+def summary(path: str = LOG_PATH) -> None:
+    """Prints the p50 / p95 duration of every phase and the counters per round across the log and its backups"""
+    durations: dict[str, list[float]] = {}
+    counts: dict[str, list[int]] = {}
+    for file in sorted(glob.glob(f"{glob.escape(path)}*")):
+        with open(file, "r", encoding="utf-8") as data:
+            for line in data:
+                record: dict = json.loads(line)
+                durations.setdefault("round", []).append(record["ms"])
+                for phase, milliseconds in phase_durations(record["spans"]):
+                    durations.setdefault(phase, []).append(milliseconds)
+                for counter, amount in record["counts"].items():
+                    counts.setdefault(counter, []).append(amount)
+    print(f"{'phase':<48}{'count':>8}{'p50 ms':>12}{'p95 ms':>12}")
+    for phase, values in sorted(durations.items()):
+        values.sort()
+        print(f"{phase:<48}{len(values):>8}{percentile(values, 0.5):>12.1f}{percentile(values, 0.95):>12.1f}")
+    print(f"\n{'counter':<48}{'rounds':>8}{'per round':>12}{'total':>12}")
+    for counter, values in sorted(counts.items()):
+        print(f"{counter:<48}{len(values):>8}{sum(values) / len(values):>12.1f}{sum(values):>12}")
+
+
+if __name__ == "__main__":
+    summary(*sys.argv[1:2])
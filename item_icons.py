@@ -0,0 +1,110 @@
+"""
+Identifies the items on the item bench from their icons in a single frame
+Each icon is embedded as a color histogram plus a downsampled patch and matched to its nearest neighbor in a bank
+The bank is generated offline from labelled icon crops: python item_icons.py <icons> [bank]
+Crops are named "<Item>_<anything>.png", empty slots use "None" as the item, for example "None_0001.png"
+Bench reads are timed on crops kept out of the bank with: python item_icons.py benchmark <icons>
+"""
+
+import os
+import sys
+from time import perf_counter
+import cv2
+import numpy as np
+from PIL import Image
+import screen_coords
+
+BANK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates", "item_icons.npz")
+PATCH_SIZE: tuple = (8, 8)
+HISTOGRAM_BINS: int = 8
+MAX_DISTANCE: float = 0.35  # Nearest neighbors further away than this aren't trusted
+MAX_DISTANCE_RATIO: float = 0.8  # Nearest label has to be this much closer than the next best label
+
+
+def embed(image: np.ndarray) -> np.ndarray:
+    """Returns the icon as a normalized color histogram followed by a downsampled patch"""
+    pixels: np.ndarray = np.ascontiguousarray(image[..., :3])
+    histogram: np.ndarray = np.concatenate(
+        [
+            np.bincount(pixels[..., channel].ravel() // (256 // HISTOGRAM_BINS), minlength=HISTOGRAM_BINS)
+            for channel in range(3)
+        ]
+    ) / (pixels.shape[0] * pixels.shape[1])
+    patch: np.ndarray = cv2.resize(pixels, PATCH_SIZE, interpolation=cv2.INTER_AREA).ravel() / 255
+    return np.concatenate([histogram, patch / np.sqrt(patch.size / histogram.size)]).astype(np.float32)
+
+
+def load_bank(path: str = BANK_PATH) -> tuple[np.ndarray, np.ndarray] | None:
+    """Returns the item labels and embeddings or None if no bank has been generated"""
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as bank:
+        return bank["labels"], bank["embeddings"]
+
+
+BANK: tuple[np.ndarray, np.ndarray] | None = load_bank()
+
+
+def classify(icons: list[np.ndarray]) -> list[tuple[str | None, bool]]:
+    """Returns (item, confident) for every icon, the item is None for empty slots"""
+    if BANK is None:
+        return [(None, False)] * len(icons)
+    labels, embeddings = BANK
+    queries: np.ndarray = np.array([embed(icon) for icon in icons])
+    distances: np.ndarray = np.linalg.norm(queries[:, None, :] - embeddings[None, :, :], axis=2)
+    results: list[tuple[str | None, bool]] = []
+    for icon_distances in distances:
+        best: int = int(np.argmin(icon_distances))
+        other_labels: np.ndarray = icon_distances[labels != labels[best]]
+        runner_up: float = float(other_labels.min()) if other_labels.size else np.inf
+        confident: bool = bool(
+            icon_distances[best] <= MAX_DISTANCE
+            and icon_distances[best] <= runner_up * MAX_DISTANCE_RATIO
+        )
+        label: str = str(labels[best])
+        results.append((None if label == "None" else label, confident))
+    return results
+
+
+def build_bank(directory: str, path: str = BANK_PATH) -> int:
+    """Embeds every labelled icon crop, every crop is kept as a neighbor"""
+    labels: list[str] = []
+    embeddings: list[np.ndarray] = []
+    for file in sorted(os.listdir(directory)):
+        if file.endswith(".png"):
+            labels.append(file.split("_")[0])
+            embeddings.append(embed(np.asarray(Image.open(os.path.join(directory, file)))))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez(path, labels=np.array(labels), embeddings=np.array(embeddings))
+    return len(labels)
+
+
+def benchmark(directory: str) -> None:
+    """Classifies the labelled icon crops a bench at a time and prints the read time and accuracy"""
+    files: list[str] = [file for file in sorted(os.listdir(directory)) if file.endswith(".png")]
+    if not files:
+        print("No labelled crops found")
+        return
+    labels: list[str] = [file.split("_")[0] for file in files]
+    icons: list[np.ndarray] = [np.asarray(Image.open(os.path.join(directory, file))) for file in files]
+    bench_size: int = len(screen_coords.ITEM_ICON_POS)
+    elapsed: float = 0.0
+    results: list[tuple[str | None, bool]] = []
+    for start in range(0, len(icons), bench_size):
+        started: float = perf_counter()
+        results.extend(classify(icons[start:start + bench_size]))
+        elapsed += perf_counter() - started
+    confident: list[bool] = [is_confident for _, is_confident in results]
+    correct: int = sum(
+        is_confident and (item or "None") == label for label, (item, is_confident) in zip(labels, results)
+    )
+    print(f"{elapsed / -(-len(icons) // bench_size) * 1000:.2f} ms per bench of {bench_size} icons")
+    print(f"{sum(confident)}/{len(icons)} icons confident, {correct}/{sum(confident)} of those correct")
+    print(f"{confident.count(False)} icons would fall back to hovering the tooltip")
+
+
+if __name__ == "__main__":
+    if sys.argv[1] == "benchmark":
+        benchmark(sys.argv[2])
+    else:
+        print(f"Saved {build_bank(*sys.argv[1:3])} item icons")
@@ -0,0 +1,245 @@
+"""
+Plans which bench item goes on which champion so the most items get completed in one pass
+Compared against the old greedy placement on synthetic inventories with: python item_planner.py [inventories]
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from time import perf_counter
+import copy
+import random
+import sys
+import game_assets
+from champion import Champion
+
+# (build, current_building, completed item count) of a champion while planning
+ChampionState = tuple[tuple[str, ...], tuple[tuple[str, str], ...], int]
+
+FULL = "full"  # Full item straight from the bench
+START = "start"  # First component of an item in the champion's build
+FINISH = "finish"  # Component that completes the item the champion is building
+
+
+@dataclass(frozen=True)
+class Placement:
+    """Drag of the item in bench slot `slot` onto the champion"""
+
+    slot: int
+    champion: Champion
+    item: str
+    kind: str
+    result: str  # Item that is completed, or started for START placements
+
+
+def transitions(item: str, state: ChampionState) -> list[tuple[ChampionState, str, str]]:
+    """Returns every (new state, kind, result) the item can cause on a champion in the state"""
+    build, building, completed = state
+    if completed >= 3:
+        return []
+    if item in game_assets.FULL_ITEMS:
+        if item not in build:
+            return []
+        remaining: list[str] = list(build)
+        remaining.remove(item)
+        return [((tuple(remaining), building, completed + 1), FULL, item)]
+    if building:
+        if building[0][1] == item:
+            return [((build, (), completed + 1), FINISH, building[0][0])]
+        return []
+    builds_into: set[str] = game_assets.COMPONENT_ITEMS.get(item, set())
+    return [
+        (
+            (
+                build[:index] + build[index + 1:],
+                ((build_item, game_assets.other_component(build_item, item)),),
+                completed,
+            ),
+            START,
+            build_item,
+        )
+        for index, build_item in enumerate(build)
+        if build_item in builds_into and build_item not in build[:index]
+    ]
+
+
+def champion_options(state: ChampionState, names: tuple[str, ...], remaining: tuple[int, ...]) -> list[tuple]:
+    """Returns the best placements one champion can take for every item count it can leave behind
+
+    Each option is (counts left afterwards, (completed, started, clicks), steps). The other champions only
+    see the counts left, so lower scoring ways to reach the same counts and reorderings are dropped.
+    """
+    options: dict[tuple[int, ...], tuple] = {}
+    seen: set[tuple] = set()
+
+    def extend(state: ChampionState, remaining: tuple[int, ...], score: tuple[int, int, int], steps: tuple) -> None:
+        for name_index, name in enumerate(names):
+            if remaining[name_index] == 0:
+                continue
+            for new_state, kind, result in transitions(name, state):
+                new_remaining: tuple[int, ...] = (
+                    remaining[:name_index] + (remaining[name_index] - 1,) + remaining[name_index + 1:]
+                )
+                new_score: tuple[int, int, int] = (
+                    score[0] + (kind != START), score[1] + (kind == START), score[2] - 2
+                )
+                if (new_state, new_remaining, new_score) in seen:
+                    continue
+                seen.add((new_state, new_remaining, new_score))
+                new_steps: tuple = steps + ((name, kind, result),)
+                if new_remaining not in options or new_score > options[new_remaining][0]:
+                    options[new_remaining] = (new_score, new_steps)
+                extend(new_state, new_remaining, new_score, new_steps)
+
+    extend(state, remaining, (0, 0, 0), ())
+    return [(new_remaining, score, steps) for new_remaining, (score, steps) in options.items()]
+
+
+def plan_items(items: list[str | None], champions: list[Champion]) -> list[Placement]:
+    """Returns the placements that complete the most items, then start the most builds, with the fewest clicks"""
+    states: tuple[ChampionState, ...] = tuple(
+        (tuple(champion.build), tuple(champion.current_building), len(champion.completed_items))
+        for champion in champions
+    )
+    names: tuple[str, ...] = tuple(sorted({item for item in items if item is not None}))
+
+    # Champions with the same build and progress share their options
+    @lru_cache(maxsize=None)
+    def options(state: ChampionState, remaining: tuple[int, ...]) -> list[tuple]:
+        return champion_options(state, names, remaining)
+
+    # Champions only compete for items, so the state is the champion index and the item counts left
+    @lru_cache(maxsize=None)
+    def best(champion_index: int, remaining: tuple[int, ...]) -> tuple[tuple[int, int, int], tuple]:
+        if champion_index == len(states):
+            return (0, 0, 0), ()
+        best_score, best_plan = best(champion_index + 1, remaining)
+        for new_remaining, score, steps in options(states[champion_index], remaining):
+            rest_score, rest_plan = best(champion_index + 1, new_remaining)
+            total: tuple[int, int, int] = tuple(map(sum, zip(score, rest_score)))
+            if total > best_score:
+                best_score = total
+                best_plan = tuple((champion_index,) + step for step in steps) + rest_plan
+        return best_score, best_plan
+
+    slots: dict[str, list[int]] = {}
+    for slot, item in enumerate(items):
+        if item is not None:
+            slots.setdefault(item, []).append(slot)
+    return [
+        Placement(slots[item].pop(0), champions[champion_index], item, kind, result)
+        for champion_index, item, kind, result in best(
+            0, tuple(items.count(name) for name in names)
+        )[1]
+    ]
+
+
+def apply(placement: Placement) -> None:
+    """Updates the champion after the placement has been clicked"""
+    champion: Champion = placement.champion
+    if placement.kind == FULL:
+        champion.build.remove(placement.item)
+        champion.completed_items.append(placement.item)
+    elif placement.kind == FINISH:
+        champion.current_building.clear()
+        champion.completed_items.append(placement.result)
+    else:
+        champion.build.remove(placement.result)
+        champion.current_building.append(
+            (placement.result, game_assets.other_component(placement.result, placement.item))
+        )
+
+
+def greedy_plan(items: list[str | None], champions: list[Champion]) -> tuple[int, int]:
+    """Places items slot by slot on the first champion that takes them like place_items did before planning
+
+    Kept as the benchmark reference, works on copies and returns (completed items, clicks)
+    """
+    items = list(items)
+    champions = copy.deepcopy(champions)
+    completed: int = 0
+    clicks: int = 0
+    for index, _ in enumerate(items):
+        for champ in champions:
+            item: str | None = items[index]
+            if item is None or not champ.does_need_items():
+                continue
+            if item in game_assets.FULL_ITEMS:
+                if item in champ.build:
+                    champ.completed_items.append(item)
+                    champ.build.remove(item)
+                    items[index] = None
+                    completed += 1
+                    clicks += 2
+            elif len(champ.current_building) == 0:
+                item_to_move: str | None = None
+                for build_item in champ.build:
+                    build_item_components: list = list(game_assets.FULL_ITEMS[build_item])
+                    if item in build_item_components:
+                        item_to_move = item
+                        build_item_components.remove(item_to_move)
+                        champ.current_building.append((build_item, build_item_components[0]))
+                        champ.build.remove(build_item)
+                if item_to_move is not None:
+                    items[index] = None
+                    clicks += 2
+            else:
+                for builditem in champ.current_building:
+                    if item == builditem[1]:
+                        champ.completed_items.append(builditem[0])
+                        champ.current_building.clear()
+                        items[index] = None
+                        completed += 1
+                        clicks += 2
+                        break
+    return completed, clicks
+
+
+def synthetic_inventory(rng: random.Random) -> tuple[list[str | None], list[Champion]]:
+    """Returns a random item bench and a board of champions with random three item builds"""
+    full_items: list[str] = sorted(game_assets.FULL_ITEMS)
+    components: list[str] = sorted(game_assets.BASIC_ITEM)
+    champions: list[Champion] = [
+        Champion(
+            name=f"Champion{index}",
+            coords=(index, 0),
+            build=rng.sample(full_items, 3),
+            slot=index,
+            size=1,
+            final_comp=True,
+        )
+        for index in range(rng.randint(1, 9))
+    ]
+    items: list[str | None] = [
+        rng.choice(components) if rng.random() < 0.8 else rng.choice(full_items) for _ in range(rng.randint(1, 10))
+    ]
+    return items + [None] * (10 - len(items)), champions
+
+
+def benchmark(inventories: int = 500, seed: int = 0) -> None:
+    """Prints items completed and clicks of the planner and the greedy placement over synthetic inventories"""
+    rng = random.Random(seed)
+    greedy_completed: int = 0
+    greedy_clicks: int = 0
+    planned_completed: int = 0
+    planned_clicks: int = 0
+    timings: list[float] = []
+    for _ in range(inventories):
+        items, champions = synthetic_inventory(rng)
+        completed, clicks = greedy_plan(items, champions)
+        greedy_completed += completed
+        greedy_clicks += clicks
+        started: float = perf_counter()
+        placements: list[Placement] = plan_items(items, champions)
+        timings.append(perf_counter() - started)
+        planned_completed += sum(placement.kind != START for placement in placements)
+        planned_clicks += 2 * len(placements)
+    print(f"Greedy: {greedy_completed} items completed with {greedy_clicks} clicks")
+    print(f"Planner: {planned_completed} items completed with {planned_clicks} clicks")
+    print(
+        f"Planning took {sum(timings) / inventories * 1000:.2f} ms on average,"
+        f" {max(timings) * 1000:.2f} ms at most"
+    )
+
+
+if __name__ == "__main__":
+    benchmark(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,93 @@
+"""
+Client for the League client (LCU) API built from the lockfile data
+"""
+
+import json
+import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
+import instrumentation
+
+REQUEST_TIMEOUT: float = 3
+TFT_NORMAL_QUEUE_ID: int = 1090  # Ranked TFT is 1100
+
+
+class LCUClient:
+    """Keeps one authenticated, pooled session to the League client for every request"""
+
+    def __init__(self, remoting_auth_token: str, server_url: str, timeout: float = REQUEST_TIMEOUT) -> None:
+        self.remoting_auth_token: str = remoting_auth_token
+        self.server_url: str = server_url
+        self.timeout: float = timeout
+        self.requests_sent: int = 0
+        self.session = requests.Session()
+        self.session.auth = HTTPBasicAuth("riot", remoting_auth_token)
+        self.session.verify = False
+        retries = Retry(
+            total=3,
+            backoff_factor=0.25,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=None,
+            raise_on_status=False,
+        )
+        self.session.mount("https://", HTTPAdapter(max_retries=retries, pool_maxsize=2))
+        instrumentation.track_total("lcu_requests", lambda: self.requests_sent)
+
+    @classmethod
+    def from_lockfile(cls, lockfile: str) -> "LCUClient":
+        """Reads the port and auth token out of the lockfile contents"""
+        data: list[str] = lockfile.split(":")
+        return cls(data[3], f"https://127.0.0.1:{data[2]}")
+
+    def request(self, method: str, endpoint: str, **kwargs) -> requests.Response | None:
+        """Sends a request to the client, returns None if the client can't be reached"""
+        self.requests_sent += 1
+        instrumentation.count("http")
+        try:
+            return self.session.request(
+                method, f"{self.server_url}{endpoint}", timeout=self.timeout, **kwargs
+            )
+        except requests.exceptions.RequestException:
+            return None
+
+    def create_lobby(self, queue_id: int = TFT_NORMAL_QUEUE_ID) -> bool:
+        """Creates a lobby for the queue"""
+        response = self.request("POST", "/lol-lobby/v2/lobby/", data=json.dumps({"queueId": queue_id}))
+        return response is not None and response.status_code == 200
+
+    def start_queue(self) -> bool:
+        """Starts matchmaking from the current lobby"""
+        response = self.request("POST", "/lol-lobby/v2/lobby/matchmaking/search")
+        return response is not None and response.status_code == 204
+
+    def is_searching(self) -> bool:
+        """Returns if matchmaking is searching"""
+        response = self.request("GET", "/lol-lobby/v2/lobby/matchmaking/search-state")
+        try:
+            return response.json()["searchState"] == "Searching"
+        except (AttributeError, ValueError, KeyError):
+            return False
+
+    def gameflow_phase(self) -> str | None:
+        """Returns the gameflow phase, "None" outside of a session and None if the client can't be reached"""
+        response = self.request("GET", "/lol-gameflow/v1/session")
+        try:
+            return response.json().get("phase", "None")
+        except (AttributeError, ValueError):
+            return None
+
+    def accept_ready_check(self) -> bool:
+        """Accepts the ready check"""
+        response = self.request("POST", "/lol-matchmaking/v1/ready-check/accept")
+        return response is not None and response.status_code in (200, 204)
+
+    def reset_arena_skin(self) -> bool:
+        """Changes the arena skin back to default"""
+        response = self.request("DELETE", "/lol-cosmetics/v1/selection/tft-map-skin")
+        return response is not None and response.status_code == 204
+
+    def reconnect(self) -> bool:
+        """Reconnects to the game in progress"""
+        response = self.request("POST", "/lol-gameflow/v1/reconnect")
+        return response is not None and response.status_code in (200, 204)
@@ -0,0 +1,116 @@
+"""
+Drives the queue from the League client's WAMP event stream instead of polling the gameflow
+"""
+
+import asyncio
+import base64
+import json
+import ssl
+import websockets
+from lcu_client import LCUClient
+
+WAMP_SUBSCRIBE: int = 5
+WAMP_EVENT: int = 8
+EVENTS: tuple = (
+    "OnJsonApiEvent_lol-gameflow_v1_gameflow-phase",
+    "OnJsonApiEvent_lol-matchmaking_v1_ready-check",
+    "OnJsonApiEvent_lol-lobby_v2_lobby",
+)
+IDLE_TIMEOUT: float = 10  # Seconds without events before the phase is re-read over HTTP
+
+
+class QueueFlow:
+    """State machine that reacts to gameflow, ready-check and lobby events"""
+
+    def __init__(self, client: LCUClient) -> None:
+        self.client: LCUClient = client
+        self.phase: str = "None"
+        self.searching = False
+
+    def on_phase(self, phase: str) -> bool:
+        """Acts on a gameflow phase, returns True once the game has started"""
+        if phase != self.phase:
+            # Back in the lobby after a cancelled search or declined ready check
+            self.searching = False
+        self.phase = phase
+        if phase == "None":
+            if self.client.create_lobby():
+                print("  Creating lobby")
+        elif phase == "Lobby" and not self.searching:
+            if self.client.start_queue():
+                print("  Starting queue")
+                self.searching = True
+        elif phase == "Matchmaking":
+            self.searching = True
+        elif phase == "ReadyCheck":
+            self.client.accept_ready_check()
+            print("  Accepting")
+        return phase == "InProgress"
+
+    def handle(self, uri: str, data) -> bool:
+        """Dispatches an event by uri, returns True once the game has started"""
+        if uri == "/lol-gameflow/v1/gameflow-phase":
+            return self.on_phase(data)
+        if uri == "/lol-matchmaking/v1/ready-check":
+            if isinstance(data, dict) and data.get("state") == "InProgress" and data.get("playerResponse") == "None":
+                self.client.accept_ready_check()
+                print("  Accepting")
+        elif uri == "/lol-lobby/v2/lobby":
+            if data is None:
+                return self.on_phase("None")
+            if self.phase == "Lobby" and not self.searching:
+                return self.on_phase("Lobby")
+        return False
+
+
+async def run_queue(client: LCUClient, idle_timeout: float = IDLE_TIMEOUT) -> None:
+    """Subscribes to the client events and returns once the game is in progress"""
+    context = ssl.create_default_context()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    token: str = base64.b64encode(f"riot:{client.remoting_auth_token}".encode()).decode()
+    flow = QueueFlow(client)
+    async with websockets.connect(
+        client.server_url.replace("https://", "wss://"),
+        ssl=context,
+        extra_headers={"Authorization": f"Basic {token}"},
+    ) as websocket:
+        for event in EVENTS:
+            await websocket.send(json.dumps([WAMP_SUBSCRIBE, event]))
+        # Events only arrive on change, so act on the phase the client is already in
+        phase: str | None = await asyncio.to_thread(client.gameflow_phase)
+        if phase is not None and await asyncio.to_thread(flow.on_phase, phase):
+            return
+        while True:
+            try:
+                message = await asyncio.wait_for(websocket.recv(), idle_timeout)
+            except asyncio.TimeoutError:
+                phase = await asyncio.to_thread(client.gameflow_phase)
+                if phase is not None and await asyncio.to_thread(flow.on_phase, phase):
+                    return
+                continue
+            if not message:
+                continue
+            payload = json.loads(message)
+            if payload[0] != WAMP_EVENT:
+                continue
+            event: dict = payload[2]
+            if await asyncio.to_thread(flow.handle, event.get("uri", ""), event.get("data")):
+                return
+
+
+def wait_for_game(client: LCUClient) -> bool:
+    """Runs the event driven queue, returns False if the event stream couldn't be used"""
+    try:
+        asyncio.run(run_queue(client))
+        return True
+    except (
+        OSError,
+        asyncio.TimeoutError,
+        websockets.exceptions.WebSocketException,
+        ValueError,  # Malformed JSON frames
+        LookupError,  # Frames missing the WAMP fields
+        TypeError,  # Frames that aren't WAMP arrays
+    ) as error:
+        print(f"  Event stream unavailable ({error}), polling the client instead")
+        return False
@@ -0,0 +1,68 @@
+"""
+Reads tactician data from the Live Client Data API that runs alongside the game
+One keep-alive session is shared and the allgamedata response is cached for a short time
+so every field read in the same tick comes from a single fetch
+"""
+
+from time import perf_counter
+import threading
+import requests
+import instrumentation
+
+ALL_GAME_DATA_URL = "https://127.0.0.1:2999/liveclientdata/allgamedata"
+SNAPSHOT_TTL: float = 0.25  # Seconds a fetched snapshot is reused for
+REQUEST_TIMEOUT: float = 0.5
+
+
+class LiveClient:
+    """Keep-alive client for the Live Client Data API with a short lived allgamedata snapshot"""
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self, url: str = ALL_GAME_DATA_URL, ttl: float = SNAPSHOT_TTL, timeout: float = REQUEST_TIMEOUT
+    ) -> None:
+        self.url: str = url
+        self.ttl: float = ttl
+        self.timeout: float = timeout
+        self.session = requests.Session()
+        self.session.verify = False
+        self.snapshot: dict | None = None
+        self.fetched_at: float = float("-inf")
+        self.fetches: int = 0
+        self.lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """Forces the next read to fetch, used after actions that change the data"""
+        with self.lock:
+            self.fetched_at = float("-inf")
+
+    def get_snapshot(self) -> dict | None:
+        """Returns the allgamedata response, None if the API can't be reached"""
+        with self.lock:
+            if perf_counter() - self.fetched_at < self.ttl:
+                return self.snapshot
+            self.fetches += 1
+            instrumentation.count("http")
+            try:
+                self.snapshot = self.session.get(self.url, timeout=self.timeout).json()
+            except requests.exceptions.Timeout:
+                pass  # Slow response, keep the last known snapshot
+            except (requests.exceptions.RequestException, ValueError):
+                self.snapshot = None
+            self.fetched_at = perf_counter()
+            return self.snapshot
+
+    def get(self, path: tuple, default=None):
+        """Returns the field at the key path inside of the snapshot or the default"""
+        value = self.get_snapshot()
+        try:
+            for key in path:
+                value = value[key]
+        except (KeyError, IndexError, TypeError):
+            return default
+        return value
+
+
+LIVE_CLIENT = LiveClient()
+# Fetches that actually went out, reads served from the snapshot don't count
+instrumentation.track_total("live_client_fetches", lambda: LIVE_CLIENT.fetches)
@@ -1,49 +1,78 @@
 """
 Handles sending input to the game, coords contain a cartesian ordered pair (x, y)
+Every input goes through the input executor so it stays in order with queued click plans
 """
 
-import random
-import pydirectinput
+from time import perf_counter
+import sys
+import input_executor
+import settings
+
+TIMING_PROFILES: dict[str, input_executor.InputTiming] = {
+    # Same pacing as pydirectinput's default 0.1s pause after every call
+    "default": input_executor.InputTiming(move=0.1, down=0.1, up=0.1, key=0.1),
+    # Only holds buttons long enough to register, bench and item pick-ups and sells wait on the screen instead
+    "fast": input_executor.InputTiming(move=0.01, down=0.03, up=0.01, key=0.03),
+}
+
+
+def set_profile(name: str) -> None:
+    """Switches the pauses after every input primitive to the named profile"""
+    input_executor.set_timing(TIMING_PROFILES[name])
+
+
+def input_time() -> float:
+    """Returns the seconds spent sending input so far"""
+    return input_executor.EXECUTOR.busy_time
+
+
+set_profile(settings.INPUT_PROFILE)
 
 
 def left_click(coords: tuple) -> None:
     """Left clicks at argument ones coordinates"""
-    offset: int = random.randint(-3, 3)
-    pydirectinput.moveTo(coords[0] - offset, coords[1] - offset)
-    pydirectinput.mouseDown()
-    pydirectinput.mouseUp()
+    input_executor.execute([input_executor.click(coords)])
 
 
 def right_click(coords: tuple) -> None:
     """Right clicks at argument ones coordinates"""
-    offset: int = random.randint(-3, 3)
-    pydirectinput.moveTo(coords[0] - offset, coords[1] - offset)
-    pydirectinput.mouseDown(button="right")
-    pydirectinput.mouseUp(button="right")
+    input_executor.execute([input_executor.click(coords, button="right")])
 
 
 def press_e(coords: tuple) -> None:
     """Presses e at argument ones coordinates"""
-    offset: int = random.randint(-3, 3)
-    pydirectinput.moveTo(coords[0] - offset, coords[1] - offset)
-    pydirectinput.press("e")
+    input_executor.execute([input_executor.press("e", coords)])
 
 
 def move_mouse(coords: tuple) -> None:
     """Moves mouse to argument ones coordinates"""
-    pydirectinput.moveTo(coords[0], coords[1])
+    input_executor.execute([input_executor.move(coords)])
 
 
 def buy_xp() -> None:
     """Presses hotkey to purchase XP"""
-    pydirectinput.press("f")
+    input_executor.execute([input_executor.press("f")])
 
 
 def reroll() -> None:
     """Presses hotkey to purchase reroll"""
-    pydirectinput.press("d")
+    input_executor.execute([input_executor.press("d")])
 
 
 def press_esc() -> None:
     """Presses escape key"""
-    pydirectinput.press("esc")
+    input_executor.execute([input_executor.press("esc")])
+
+
+
+def benchmark(clicks: int = 18) -> None:
+    """Times a click plan the size of a full item placement against a recording sink for every profile"""
+    for name, timing in TIMING_PROFILES.items():
+        executor = input_executor.InputExecutor(input_executor.RecordingSink(), timing)
+        started: float = perf_counter()
+        executor.execute([input_executor.click((960, 540)) for _ in range(clicks)])
+        print(f"{name}: {clicks} clicks in {(perf_counter() - started) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    benchmark(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,121 @@
+"""
+Matches OCR results to the closest valid champion or item name
+Accuracy on misreads and agreement with a brute force search are checked with: python name_matcher.py [misreads]
+"""
+
+import random
+import string
+import sys
+from collections import Counter
+from difflib import SequenceMatcher
+from functools import lru_cache
+from time import perf_counter
+
+
+def trigrams(text: str) -> set[str]:
+    """Returns the padded, lowercase character trigrams of the text"""
+    padded: str = f"  {text.lower()} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+class NameMatcher:
+    """Trigram index over a fixed set of names with a memo of OCR string -> best match"""
+
+    # pylint: disable=too-few-public-methods
+    def __init__(self, names, substring: bool = False, cache_size: int = 1024) -> None:
+        self.names: tuple[str, ...] = tuple(sorted(names))
+        self.name_set: frozenset[str] = frozenset(self.names)
+        # Counts a name found inside of the OCR string as an exact match
+        self.substring: bool = substring
+        self.index: dict[str, list[int]] = {}
+        for name_index, name in enumerate(self.names):
+            for gram in trigrams(name):
+                self.index.setdefault(gram, []).append(name_index)
+        self.match = lru_cache(maxsize=cache_size)(self.best_match)
+
+    def best_match(self, text: str) -> tuple[str, float]:
+        """Returns the name with the highest similarity ratio to the text and its ratio"""
+        if text in self.name_set:
+            return text, 1.0
+        if self.substring:
+            contained: list[str] = [name for name in self.names if name in text]
+            if contained:
+                return max(contained, key=len), 1.0
+
+        # Names sharing the most trigrams go first so the ratio bounds prune the rest early
+        shared: Counter = Counter(
+            name_index for gram in trigrams(text) for name_index in self.index.get(gram, ())
+        )
+        order: list[int] = sorted(range(len(self.names)), key=lambda name_index: -shared[name_index])
+        matcher = SequenceMatcher(b=text)
+        best_name, best_ratio = "", 0.0
+        for name_index in order:
+            matcher.set_seq1(self.names[name_index])
+            if matcher.real_quick_ratio() <= best_ratio or matcher.quick_ratio() <= best_ratio:
+                continue
+            ratio: float = matcher.ratio()
+            if ratio > best_ratio:
+                best_name, best_ratio = self.names[name_index], ratio
+        return best_name, best_ratio
+
+
+def brute_force_match(names, text: str, substring: bool = False) -> tuple[str, float]:
+    """Returns the best match and its ratio by scoring every name, the reference for NameMatcher"""
+    if substring and (contained := [name for name in names if name in text]):
+        return max(contained, key=len), 1.0
+    return max(
+        ((name, SequenceMatcher(a=name, b=text).ratio()) for name in sorted(names)),
+        key=lambda match: match[1],
+        default=("", 0.0),
+    )
+
+
+def misread(name: str, rng: random.Random) -> str:
+    """Returns the name with one to three random character substitutions, deletions or insertions"""
+    characters: list[str] = list(name)
+    for _ in range(rng.randint(1, 3)):
+        position: int = rng.randrange(len(characters) + 1)
+        edit: str = rng.choice(("substitute", "delete", "insert"))
+        if edit == "insert" or not characters or position == len(characters):
+            characters.insert(position, rng.choice(string.ascii_letters + " '."))
+        elif edit == "delete":
+            del characters[position]
+        else:
+            characters[position] = rng.choice(string.ascii_letters)
+    return "".join(characters)
+
+
+def timed_matches(match, texts: list[str]) -> tuple[list[tuple[str, float]], float]:
+    """Returns the match of every text and the average seconds per call"""
+    started: float = perf_counter()
+    matches: list[tuple[str, float]] = [match(text) for text in texts]
+    return matches, (perf_counter() - started) / len(texts)
+
+
+def benchmark(names, threshold: float, substring: bool = False, misreads: int = 3000, seed: int = 0) -> None:
+    """Prints the matcher's accuracy on misread names, its disagreements with brute force and its latency"""
+    rng = random.Random(seed)
+    pool: list[str] = sorted(names)
+    samples: list[tuple[str, str]] = [(name, misread(name, rng)) for name in rng.choices(pool, k=misreads)]
+    texts: list[str] = [text for _, text in samples]
+    matches, matcher_time = timed_matches(NameMatcher(names, substring=substring, cache_size=0).best_match, texts)
+    references, brute_force_time = timed_matches(lambda text: brute_force_match(pool, text, substring), texts)
+
+    correct: int = sum(match == name and ratio >= threshold for (name, _), (match, ratio) in zip(samples, matches))
+    # Equal ratios can pick different names, so only a different best ratio counts as a mismatch
+    mismatches: int = sum(match[1] != reference[1] for match, reference in zip(matches, references))
+    print(f"{correct}/{misreads} misreads matched to the right name at a ratio of at least {threshold}")
+    print(f"{mismatches} mismatches against brute force")
+    print(f"Trigram index: {matcher_time * 1e6:.0f} us per uncached call")
+    print(f"Brute force: {brute_force_time * 1e6:.0f} us per call")
+
+
+if __name__ == "__main__":
+    import game_assets
+
+    count: int = int(sys.argv[1]) if sys.argv[1:] else 3000
+    print("Champions:")
+    # Same thresholds as arena_functions.valid_champ and valid_item
+    benchmark(game_assets.CHAMPIONS, 0.7, misreads=count)
+    print("Items:")
+    benchmark(game_assets.ITEMS, 0.85, substring=True, misreads=count)
@@ -1,12 +1,25 @@
 """
 Contains all code related to turning a screenshot into a string
+Engine pooling, batched reads and buffered preprocessing are timed against what they replaced with:
+python ocr.py [image] [reads]
 """
 
-from typing import Any
+from collections import OrderedDict
+from contextlib import contextmanager
+import atexit
+import hashlib
+import sys
+import threading
+import tracemalloc
+from time import perf_counter
+from typing import Any, Iterator
 import cv2
 import numpy as np
-from PIL import ImageGrab
+from PIL import Image
 from tesserocr import PyTessBaseAPI
+import instrumentation
+import screen_capture
+from screen_capture import Frame
 import settings
 
 TESSDATA_PATH = settings.TESSERACT_TESSDATA_PATH
@@ -14,54 +27,288 @@ TESSDATA_PATH = settings.TESSERACT_TESSDATA_PATH
 ALPHABET_WHITELIST = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
 ROUND_WHITELIST = "0123456789-"
 
+# Idle Tesseract engines keyed by (psm, whitelist), loading the language model is the slow part
+_ENGINE_POOL: dict[tuple[int, str], list[PyTessBaseAPI]] = {}
+_ENGINE_POOL_LOCK = threading.Lock()
 
-def image_grayscale(image: ImageGrab.Image) -> Any:
+# Per thread preprocessing buffers keyed by (height, width, scale) of the region
+_BUFFERS = threading.local()
+
+
+class RecognitionCache:
+    """Bounded LRU of OCR results keyed by a checksum of the region pixels and the OCR settings"""
+
+    def __init__(self, maxsize: int = 512) -> None:
+        self.maxsize: int = maxsize
+        self.entries: OrderedDict[tuple, str] = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @staticmethod
+    def key(image: np.ndarray, *ocr_settings) -> tuple:
+        """Returns the cache key for the region pixels read with the OCR settings"""
+        pixels: np.ndarray = np.ascontiguousarray(image)
+        return (pixels.shape, hashlib.blake2b(pixels, digest_size=16).digest(), *ocr_settings)
+
+    def get(self, key: tuple) -> str | None:
+        """Returns the text read the last time these pixels were seen or None"""
+        with self.lock:
+            text: str | None = self.entries.get(key)
+            if text is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return text
+
+    def clear(self) -> None:
+        """Forgets every stored result"""
+        with self.lock:
+            self.entries.clear()
+
+    def put(self, key: tuple, text: str) -> None:
+        """Stores the text read from the pixels, evicting the least recently used entry when full"""
+        with self.lock:
+            self.entries[key] = text
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+
+OCR_CACHE = RecognitionCache()
+# Hits are OCR calls the cache saved, misses are the calls that still reached Tesseract
+instrumentation.track_total("ocr_cache_hits", lambda: OCR_CACHE.hits)
+instrumentation.track_total("ocr_cache_misses", lambda: OCR_CACHE.misses)
+
+
+def image_grayscale(image: Image.Image) -> Any:
     """Converts an image to grayscale so OCR has an easier time deciphering characters"""
     return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
 
 
-def image_thresholding(image: ImageGrab.Image) -> Any:
+def image_thresholding(image: Image.Image) -> Any:
     """Applies thresholding to the image https://docs.opencv.org/4.x/d7/d4d/tutorial_py_thresholding.html"""
     return cv2.threshold(image, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)[1]
 
 
-def image_array(image: ImageGrab.Image) -> Any:
-    """Turns the image into an array"""
-    image = np.array(image)
-    image = image[..., :3]
-    return image
+def image_array(image: Image.Image | np.ndarray) -> np.ndarray:
+    """Returns a view of the image's RGB channels"""
+    return np.asarray(image)[..., :3]
 
 
-def image_resize(image: int, scale: int) -> Any:
-    """Resizes the image using the scale passed in argument two"""
-    (width, height) = (image.width * scale, image.height * scale)
-    return image.resize((width, height))
+def preprocess(image: Image.Image | np.ndarray, scale: int) -> np.ndarray:
+    """Grayscales, upscales and thresholds the image into buffers reused for every region of the same size
 
+    The returned array is overwritten by the next call for the same size on the same thread
+    """
+    pixels: np.ndarray = image_array(image)
+    (height, width) = pixels.shape[:2]
+    buffers: dict = _BUFFERS.__dict__.setdefault("by_size", {})
+    if (height, width, scale) not in buffers:
+        buffers[(height, width, scale)] = (
+            np.empty((height, width), dtype=np.uint8),
+            np.empty((height * scale, width * scale), dtype=np.uint8),
+            np.empty((height * scale, width * scale), dtype=np.uint8),
+        )
+    grayscale, resize, thresholding = buffers[(height, width, scale)]
+    # Grayscale before upscaling so the resize only touches one channel
+    cv2.cvtColor(pixels, cv2.COLOR_BGR2GRAY, dst=grayscale)
+    cv2.resize(grayscale, (width * scale, height * scale), dst=resize, interpolation=cv2.INTER_CUBIC)
+    cv2.threshold(resize, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU, dst=thresholding)
+    return thresholding
 
-def get_text(screenxy: tuple, scale: int, psm: int, whitelist: str = "") -> str:
-    """Returns text from screen coordinates"""
-    screenshot = ImageGrab.grab(bbox=screenxy)
-    resize = image_resize(screenshot, scale)
-    array = image_array(resize)
-    grayscale = image_grayscale(array)
-    thresholding = image_thresholding(grayscale)
-    with PyTessBaseAPI(path=TESSDATA_PATH) as api:
+
+@contextmanager
+def tesseract_engine(psm: int, whitelist: str = "") -> Iterator[PyTessBaseAPI]:
+    """Borrows an initialised engine for the psm / whitelist pair and returns it to the pool afterwards"""
+    key: tuple[int, str] = (psm, whitelist)
+    with _ENGINE_POOL_LOCK:
+        idle: list[PyTessBaseAPI] = _ENGINE_POOL.setdefault(key, [])
+        api: PyTessBaseAPI | None = idle.pop() if idle else None
+    if api is None:
+        api = PyTessBaseAPI(path=TESSDATA_PATH)
         api.SetVariable("tessedit_char_whitelist", whitelist)
         api.SetPageSegMode(psm)
+    try:
+        yield api
+    finally:
+        api.Clear()
+        with _ENGINE_POOL_LOCK:
+            idle.append(api)
+
+
+@atexit.register
+def close_engines() -> None:
+    """Frees every pooled engine"""
+    with _ENGINE_POOL_LOCK:
+        for idle in _ENGINE_POOL.values():
+            for api in idle:
+                api.End()
+        _ENGINE_POOL.clear()
+
+
+def recognize(thresholding: np.ndarray, psm: int, whitelist: str = "") -> str:
+    """Runs a pooled Tesseract engine over a single channel thresholded image
+
+    tesserocr only accepts a bytes object, so the contiguous buffer is copied exactly once here
+    """
+    instrumentation.count("ocr")
+    with tesseract_engine(psm, whitelist) as api:
         api.SetImageBytes(thresholding.tobytes(),thresholding.shape[1], thresholding.shape[0],1,thresholding.shape[1])
         text = api.GetUTF8Text()
     return text.strip()
 
 
-def get_text_from_image(image: ImageGrab.Image, whitelist: str = "") -> str:
+def read_image(image: Image.Image | np.ndarray, scale: int, psm: int, whitelist: str = "") -> str:
+    """Returns the text inside of the image, reusing the last result if the pixels haven't changed"""
+    key: tuple = OCR_CACHE.key(image_array(image), scale, psm, whitelist)
+    text: str | None = OCR_CACHE.get(key)
+    if text is not None:
+        return text
+    text = recognize(preprocess(image, scale), psm, whitelist)
+    OCR_CACHE.put(key, text)
+    return text
+
+
+def stack_strip(thresholdings: list[np.ndarray], separator: int) -> tuple[np.ndarray, list[tuple[int, int, int]]]:
+    """Stacks thresholded regions into one strip, returns it with the (top, width, height) of every region"""
+    # Thresholded background is white, so white padding and separators don't add characters
+    width: int = max(thresholding.shape[1] for thresholding in thresholdings)
+    height: int = sum(thresholding.shape[0] + separator for thresholding in thresholdings)
+    strip: np.ndarray = np.full((height, width), 255, dtype=np.uint8)
+    rectangles: list[tuple[int, int, int]] = []
+    top: int = 0
+    for thresholding in thresholdings:
+        strip[top:top + thresholding.shape[0], :thresholding.shape[1]] = thresholding
+        rectangles.append((top, thresholding.shape[1], thresholding.shape[0]))
+        top += thresholding.shape[0] + separator
+    return strip, rectangles
+
+
+def get_text_batch(images: list, scale: int = 3, psm: int = 7, whitelist: str = "") -> list[str]:
+    """Reads several regions with one engine by stacking them into a single strip, one rectangle per region"""
+    texts: list[str | None] = []
+    misses: list[tuple[int, tuple, np.ndarray]] = []
+    for index, image in enumerate(images):
+        key: tuple = OCR_CACHE.key(image_array(image), scale, psm, whitelist)
+        texts.append(OCR_CACHE.get(key))
+        if texts[-1] is None:
+            # Copied because the preprocessing buffer is shared by regions of the same size
+            misses.append((index, key, preprocess(image, scale).copy()))
+    if not misses:
+        return texts
+
+    strip, rectangles = stack_strip([thresholding for _, _, thresholding in misses], 4 * scale)
+
+    instrumentation.count("ocr", len(misses))
+    with tesseract_engine(psm, whitelist) as api:
+        api.SetImageBytes(strip.tobytes(), strip.shape[1], strip.shape[0], 1, strip.shape[1])
+        for (index, key, _), (top, rectangle_width, rectangle_height) in zip(misses, rectangles):
+            api.SetRectangle(0, top, rectangle_width, rectangle_height)
+            texts[index] = api.GetUTF8Text().strip()
+            OCR_CACHE.put(key, texts[index])
+    return texts
+
+
+def get_text(screenxy: tuple, scale: int, psm: int, whitelist: str = "", frame: Frame | None = None) -> str:
+    """Returns text from screen coordinates, cropped from the frame if one is passed in"""
+    screenshot = screen_capture.grab(screenxy) if frame is None else frame.crop(screenxy)
+    return read_image(screenshot, scale, psm, whitelist)
+
+
+def get_text_from_image(image: Image.Image | np.ndarray, whitelist: str = "") -> str:
     """Takes an image and returns the text"""
-    resize = image_resize(image, 3)
-    array = image_array(resize)
-    grayscale = image_grayscale(array)
-    thresholding = image_thresholding(grayscale)
+    return read_image(image, 3, 7, whitelist)
+
+
+def fresh_engine_read(thresholding: np.ndarray, psm: int, whitelist: str = "") -> str:
+    """Reads the image the way every call did before pooling, loading a new engine each time"""
     with PyTessBaseAPI(path=TESSDATA_PATH) as api:
         api.SetVariable("tessedit_char_whitelist", whitelist)
-        api.SetPageSegMode(7)
+        api.SetPageSegMode(psm)
         api.SetImageBytes(thresholding.tobytes(),thresholding.shape[1], thresholding.shape[0],1,thresholding.shape[1])
         text = api.GetUTF8Text()
     return text.strip()
+
+
+def sample_image(text: str) -> np.ndarray:
+    """Returns a shop name sized crop with the text rendered on it"""
+    image: np.ndarray = np.zeros((20, 120, 3), dtype=np.uint8)
+    cv2.putText(image, text, (4, 16), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+    return image
+
+
+def benchmark(path: str = "", reads: int = 50) -> None:
+    """Times uncached reads of one image with a new engine per call and with the engine pool"""
+    image: np.ndarray = image_array(Image.open(path)) if path else sample_image("Ahri")
+    thresholding: np.ndarray = preprocess(image, 3)
+    for name, read in (("New engine per read", fresh_engine_read), ("Pooled engine", recognize)):
+        started: float = perf_counter()
+        for _ in range(reads):
+            text: str = read(thresholding, 7)
+        print(f"{name}: {(perf_counter() - started) / reads * 1000:.2f} ms per read, read {text!r}")
+
+
+def threaded_read(images: list[np.ndarray]) -> list[str]:
+    """Reads every region on its own thread and engine like get_shop did before batching"""
+    texts: list[str] = [""] * len(images)
+
+    def read(index: int) -> None:
+        texts[index] = recognize(preprocess(images[index], 3), 7)
+
+    threads: list[threading.Thread] = [
+        threading.Thread(target=read, args=(index,)) for index in range(len(images))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return texts
+
+
+def batch_benchmark(shops: int = 50) -> None:
+    """Times uncached reads of a five name shop on five threads and in a single batched pass"""
+    images: list[np.ndarray] = [sample_image(name) for name in ("Ahri", "Zed", "Lux", "Jinx", "Yasuo")]
+
+    def batch_read(images: list[np.ndarray]) -> list[str]:
+        OCR_CACHE.clear()
+        return get_text_batch(images)
+
+    for name, read in (("Threaded", threaded_read), ("Batched", batch_read)):
+        started: float = perf_counter()
+        for _ in range(shops):
+            texts: list[str] = read(images)
+        print(f"{name}: {(perf_counter() - started) / shops * 1000:.2f} ms per shop, read {texts}")
+
+
+def unbuffered_preprocess(image: Image.Image | np.ndarray, scale: int) -> np.ndarray:
+    """Upscales, grayscales and thresholds the image the way reads did before the reused buffers"""
+    if isinstance(image, np.ndarray):
+        image = Image.fromarray(image_array(image))
+    resize = image.resize((image.width * scale, image.height * scale))
+    return image_thresholding(image_grayscale(image_array(resize)))
+
+
+def preprocess_benchmark(image: np.ndarray, reads: int = 2000) -> None:
+    """Times preprocessing one region with fresh arrays for every step and with the reused buffers
+
+    Allocations are traced through tracemalloc, which doesn't see PIL's own buffers, so the old path's are a lower bound
+    """
+    for name, prepare in (("Fresh arrays", unbuffered_preprocess), ("Reused buffers", preprocess)):
+        prepare(image, 3)  # Creates the buffers so they aren't counted as per read allocations
+        started: float = perf_counter()
+        for _ in range(reads):
+            prepare(image, 3)
+        elapsed: float = perf_counter() - started
+        tracemalloc.start()
+        prepare(image, 3)
+        peak: int = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{name}: {elapsed / reads * 1e6:.1f} us per region, {peak / 1024:.1f} KiB allocated per read")
+
+
+if __name__ == "__main__":
+    benchmark(*sys.argv[1:2], *(int(argument) for argument in sys.argv[2:3]))
+    batch_benchmark()
+    preprocess_benchmark(image_array(Image.open(sys.argv[1])) if sys.argv[1:] else sample_image("Ahri"))
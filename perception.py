@@ -0,0 +1,114 @@
+"""
+Keeps a cached game state where every field is refreshed on its own cadence
+Callers read the cached state and invalidate fields after actions that change them
+"""
+
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Callable
+import arena_functions
+import game_functions
+import input_executor
+import instrumentation
+import screen_capture
+from screen_capture import Frame
+
+
+@dataclass
+class GameState:
+    """Last known value of everything the bot reads from the game"""
+
+    round: str = "0-0"
+    gold: int = 0
+    level: int = 1
+    health: int = 100
+    shop: list = field(default_factory=list)
+    bench_occupied: list = field(default_factory=lambda: [False] * 9)
+    alive: bool = True
+
+
+@dataclass
+class FieldSchedule:
+    """How and how often a single GameState field is refreshed, lower priority refreshes first"""
+
+    reader: Callable[[Frame | None], Any]
+    interval: float
+    priority: int
+    uses_frame: bool = True
+    refreshed_at: float = float("-inf")
+
+
+class PerceptionScheduler:
+    """Refreshes stale GameState fields, capturing at most one frame per tick"""
+
+    def __init__(self) -> None:
+        self.state = GameState()
+        self.frame: Frame | None = None  # Last captured frame, the cached fields were read from it
+        self.captures: int = 0
+        self.refreshes: dict[str, int] = {}
+        self.ticks: int = 0
+        self.busy_time: float = 0.0  # Seconds spent in tick, perception_ms / perception_ticks is the read latency
+        self.schedules: dict[str, FieldSchedule] = {
+            "health": FieldSchedule(lambda frame: arena_functions.get_health(), 0.5, 0, uses_frame=False),
+            "round": FieldSchedule(game_functions.get_round, 0.5, 1),
+            "level": FieldSchedule(lambda frame: arena_functions.get_level(), 1, 2, uses_frame=False),
+            "gold": FieldSchedule(arena_functions.get_gold, 1, 3),
+            "bench_occupied": FieldSchedule(arena_functions.bench_occupied_check, 1, 4),
+            "shop": FieldSchedule(arena_functions.get_shop, 2, 5),
+            "alive": FieldSchedule(game_functions.check_alive, 5, 6),
+        }
+        # Captures per second of a round come from its captures counter and its duration
+        instrumentation.track_total("captures", lambda: self.captures)
+        instrumentation.track_total("field_refreshes", lambda: sum(self.refreshes.values()))
+        instrumentation.track_total("perception_ticks", lambda: self.ticks)
+        instrumentation.track_total("perception_ms", lambda: round(self.busy_time * 1000))
+
+    def invalidate(self, *names: str) -> None:
+        """Marks the fields, or every field if none are passed, as stale"""
+        for name in names or self.schedules:
+            self.schedules[name].refreshed_at = float("-inf")
+
+    def is_stale(self, name: str, now: float) -> bool:
+        """Returns if the field is due for a refresh"""
+        schedule: FieldSchedule = self.schedules[name]
+        return now - schedule.refreshed_at >= schedule.interval
+
+    def next_refresh(self, names: tuple) -> float:
+        """Returns the seconds until the first of the fields is due"""
+        now: float = perf_counter()
+        return max(
+            0.0,
+            min(self.schedules[name].refreshed_at + self.schedules[name].interval - now for name in names),
+        )
+
+    def tick(self, names: tuple | None = None) -> GameState:
+        """Refreshes every stale field out of names, or out of all fields, and returns the state"""
+        now: float = perf_counter()
+        self.ticks += 1
+        stale: list[str] = sorted(
+            (name for name in names or self.schedules if self.is_stale(name, now)),
+            key=lambda name: self.schedules[name].priority,
+        )
+        frame: Frame | None = None
+        for name in stale:
+            schedule: FieldSchedule = self.schedules[name]
+            if schedule.uses_frame and frame is None:
+                # Queued clicks have to land before the screen can be read
+                input_executor.wait_idle()
+                frame = self.frame = screen_capture.Frame.grab()
+                self.captures += 1
+            setattr(self.state, name, schedule.reader(frame))
+            schedule.refreshed_at = perf_counter()
+            self.refreshes[name] = self.refreshes.get(name, 0) + 1
+        self.busy_time += perf_counter() - now
+        return self.state
+
+    def read(self, name: str) -> Any:
+        """Returns the field, refreshing it first if it's stale"""
+        self.tick((name,))
+        return getattr(self.state, name)
+
+    def refresh(self, name: str) -> Any:
+        """Returns the field after reading it from the game regardless of its cadence"""
+        self.invalidate(name)
+        return self.read(name)
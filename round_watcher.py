@@ -0,0 +1,131 @@
+"""
+Watches the round label on a background thread and only reads it again when its pixels change
+"""
+
+import hashlib
+import queue
+import sys
+import threading
+from dataclasses import dataclass
+from time import perf_counter
+import numpy as np
+import game_assets
+import game_functions
+import screen_capture
+import screen_coords
+
+WATCH_RATE: int = 20
+
+# Seconds between reads while the label doesn't hold a valid round, e.g. mid animation
+RECHECK_INTERVAL: float = 0.5
+
+
+@dataclass
+class RoundChange:
+    """Published once the round label shows a new round"""
+
+    round: str
+    changed_at: float  # perf_counter when the label pixels last changed before the read
+    read_at: float  # perf_counter when the new round was read
+
+
+class RoundWatcher:
+    """Hashes the round label at WATCH_RATE and publishes a RoundChange when it reads a new round"""
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, rate: int = WATCH_RATE) -> None:
+        self.interval: float = 1 / rate
+        self.round: str = "0-0"
+        self.events: queue.Queue = queue.Queue()
+        self.polls: int = 0
+        self.reads: int = 0
+        self.last_hash: bytes | None = None
+        self.label_valid: bool = False
+        self.changed_at: float = float("-inf")
+        self.read_at: float = float("-inf")
+        self.error: Exception | None = None  # Failure that stopped the background thread, raised to the waiter
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="RoundWatcher", daemon=True)
+
+    def start(self) -> "RoundWatcher":
+        """Starts watching on the background thread"""
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops the background thread"""
+        self.stop_event.set()
+        if self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    @staticmethod
+    def label_hash(round_capture: np.ndarray) -> bytes:
+        """Returns a digest of the round label pixels"""
+        return hashlib.blake2b(np.ascontiguousarray(round_capture), digest_size=16).digest()
+
+    def poll(self, round_capture: np.ndarray) -> None:
+        """Reads the round if the label changed and publishes it if it's new"""
+        self.polls += 1
+        now: float = perf_counter()
+        label_hash: bytes = self.label_hash(round_capture)
+        if label_hash != self.last_hash:
+            self.last_hash = label_hash
+            self.changed_at = now
+        elif self.label_valid or now - self.read_at < RECHECK_INTERVAL:
+            return
+        self.reads += 1
+        self.read_at = now
+        game_round: str = game_functions.read_round(round_capture)
+        self.label_valid = game_round in game_assets.ROUNDS
+        if self.label_valid and game_round != self.round:
+            self.round = game_round
+            self.events.put(RoundChange(game_round, self.changed_at, perf_counter()))
+
+    def run(self) -> None:
+        """Polls the round label until stopped or a grab or read fails"""
+        try:
+            while not self.stop_event.is_set():
+                started: float = perf_counter()
+                self.poll(screen_capture.grab(screen_coords.ROUND_POS.get_coords()))
+                self.stop_event.wait(max(0.0, self.interval - (perf_counter() - started)))
+        except Exception as error:  # pylint: disable=broad-except
+            # The round would stay frozen otherwise, the game loop re-raises it from wait_for_change
+            print(f"  [!] Round watcher stopped: {error!r}")
+            self.error = error
+
+    def raise_error(self) -> None:
+        """Raises the failure that stopped the background thread"""
+        if self.error is not None:
+            raise self.error
+
+    def wait_for_change(self, timeout: float) -> RoundChange | None:
+        """Returns the next RoundChange, or None if there wasn't one within the timeout"""
+        self.raise_error()
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            self.raise_error()
+            return None
+
+
+def replay_latency(path: str) -> None:
+    """Runs the watcher over every frame of a replay and prints how often it read and how fast it reacted"""
+    source = screen_capture.ReplaySource(path)
+    watcher = RoundWatcher()
+    latencies: list[float] = []
+    for _ in range(len(source)):
+        watcher.poll(source.grab(screen_coords.ROUND_POS.get_coords()))
+        while not watcher.events.empty():
+            change: RoundChange = watcher.events.get()
+            latencies.append((change.read_at - change.changed_at) * 1000)
+            print(f"{change.round}: read {latencies[-1]:.1f} ms after the label changed")
+    print(f"{watcher.reads} reads over {watcher.polls} polls")
+    if latencies:
+        print(
+            f"Mean {sum(latencies) / len(latencies):.1f} ms, max {max(latencies):.1f} ms,"
+            f" plus up to {1000 / WATCH_RATE:.0f} ms until the next poll live"
+        )
+
+
+if __name__ == "__main__":
+    replay_latency(sys.argv[1])
@@ -0,0 +1,194 @@
+"""
+Captures the game window once per tick so every reader crops its region from the same moment
+The capture source is pluggable so recorded frames can be replayed without the game client
+"""
+
+from pathlib import Path
+from time import perf_counter
+import threading
+import cv2
+from PIL import Image, ImageGrab
+import numpy as np
+import instrumentation
+import screen_coords
+from vec4 import Vec4
+
+try:
+    import mss
+except ImportError:
+    mss = None
+
+
+def crop(image: np.ndarray, coords: tuple) -> np.ndarray:
+    """Returns a view of the (x, y, x+w, y+h) box inside of the image, no pixels are copied"""
+    return image[coords[1]:coords[3], coords[0]:coords[2]]
+
+
+class CaptureSource:
+    """Interface for anything that returns RGB pixels for a (x, y, x+w, y+h) screen box"""
+
+    # pylint: disable=too-few-public-methods
+    def grab(self, bbox: tuple) -> np.ndarray:
+        """Returns the pixels inside of the screen box as a (height, width, 3) array"""
+        raise NotImplementedError
+
+
+class ImageGrabSource(CaptureSource):
+    """Live capture through PIL, works everywhere but is the slowest option"""
+
+    # pylint: disable=too-few-public-methods
+    def grab(self, bbox: tuple) -> np.ndarray:
+        return np.asarray(ImageGrab.grab(bbox=bbox))[..., :3]
+
+
+class MssSource(CaptureSource):
+    """Live capture through mss, which keeps the device context open between grabs"""
+
+    # pylint: disable=too-few-public-methods
+    def __init__(self) -> None:
+        if mss is None:
+            raise ImportError("mss is not installed")
+        self.local = threading.local()
+
+    def grab(self, bbox: tuple) -> np.ndarray:
+        # mss instances can't be shared between threads
+        if not hasattr(self.local, "screen"):
+            self.local.screen = mss.mss()
+        screenshot = self.local.screen.grab(
+            {"left": bbox[0], "top": bbox[1], "width": bbox[2] - bbox[0], "height": bbox[3] - bbox[1]}
+        )
+        return cv2.cvtColor(np.asarray(screenshot), cv2.COLOR_BGRA2RGB)
+
+
+class ReplaySource(CaptureSource):
+    """Serves recorded game window frames in timestamp order, one frame per grab
+
+    Argument one is either a directory of .png / .npz frames named by their timestamp
+    or a .npy frame archive of shape (frames, height, width, 3) which is memory mapped
+    Frames are whole screens unless a .npz stores the screen box it was grabbed from
+    """
+
+    def __init__(self, path: str, loop: bool = False) -> None:
+        self.path = Path(path)
+        self.loop: bool = loop
+        self.index: int = 0
+        self.lock = threading.Lock()  # The round watcher and the main thread both pull frames
+        self.archive: np.ndarray | None = None
+        self.files: list[Path] = []
+        if self.path.is_dir():
+            self.files = sorted(
+                (file for file in self.path.iterdir() if file.suffix in (".png", ".npz")),
+                key=ReplaySource.frame_timestamp,
+            )
+        else:
+            self.archive = np.load(self.path, mmap_mode="r")
+
+    @staticmethod
+    def frame_timestamp(file: Path) -> tuple:
+        """Sort key for recorded frame files, falls back to the file name if the stem isn't a number"""
+        try:
+            return (float(file.stem), file.name)
+        except ValueError:
+            return (float("inf"), file.name)
+
+    def __len__(self) -> int:
+        return len(self.archive) if self.archive is not None else len(self.files)
+
+    def next_frame(self) -> tuple[np.ndarray, tuple]:
+        """Returns the next recorded frame and the (x, y) screen position of its top left corner"""
+        with self.lock:
+            if self.index >= len(self):
+                if not self.loop or len(self) == 0:
+                    raise EOFError(f"No frames left to replay in {self.path}")
+                self.index = 0
+            index: int = self.index
+            self.index += 1
+        origin: tuple = (0, 0)
+        if self.archive is not None:
+            frame: np.ndarray = self.archive[index]
+        elif self.files[index].suffix == ".npz":
+            with np.load(self.files[index]) as data:
+                frame: np.ndarray = data["frame"]
+                if "bbox" in data:
+                    # pylint: disable-next=unsubscriptable-object
+                    origin = tuple(int(value) for value in data["bbox"][:2])
+        else:
+            frame: np.ndarray = np.asarray(Image.open(self.files[index]))
+        return frame[..., :3], origin
+
+    def grab(self, bbox: tuple) -> np.ndarray:
+        frame, origin = self.next_frame()
+        box: tuple = (bbox[0] - origin[0], bbox[1] - origin[1], bbox[2] - origin[0], bbox[3] - origin[1])
+        if min(box) < 0 or box[2] > frame.shape[1] or box[3] > frame.shape[0]:
+            raise ValueError(f"Screen box {bbox} is outside of the recorded frame at {origin}")
+        return crop(frame, box)
+
+
+class RecordingSource(CaptureSource):
+    """Wraps another source and saves every grab with its screen box as a .npz a ReplaySource can read back"""
+
+    # pylint: disable=too-few-public-methods
+    def __init__(self, source: CaptureSource, directory: str) -> None:
+        self.source: CaptureSource = source
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def grab(self, bbox: tuple) -> np.ndarray:
+        image: np.ndarray = self.source.grab(bbox)
+        np.savez(self.directory / f"{perf_counter():.6f}.npz", frame=image, bbox=np.asarray(bbox))
+        return image
+
+
+def default_source() -> CaptureSource:
+    """Returns the fastest live capture source available"""
+    return MssSource() if mss is not None else ImageGrabSource()
+
+
+_source: CaptureSource = default_source()
+
+
+def set_source(source: CaptureSource) -> None:
+    """Replaces the capture source used by every reader"""
+    global _source  # pylint: disable=global-statement
+    _source = source
+
+
+def grab(bbox: tuple) -> np.ndarray:
+    """Returns the pixels inside of the screen box from the current capture source"""
+    instrumentation.count("grab")
+    return _source.grab(bbox)
+
+
+class Frame:
+    """Snapshot of the whole game window that screen regions are cropped from as NumPy views"""
+
+    def __init__(self, image: np.ndarray, origin: tuple) -> None:
+        self.image: np.ndarray = image
+        self.origin: tuple = origin
+
+    @classmethod
+    def grab(cls) -> "Frame":
+        """Captures the game window"""
+        coords: tuple = screen_coords.GAME_WINDOW_POS.get_coords()
+        return cls(grab(coords), coords[:2])
+
+    def crop(self, screenxy: tuple) -> np.ndarray:
+        """Returns a view of the screen coordinates passed in argument one"""
+        return crop(
+            self.image,
+            (
+                screenxy[0] - self.origin[0],
+                screenxy[1] - self.origin[1],
+                screenxy[2] - self.origin[0],
+                screenxy[3] - self.origin[1],
+            ),
+        )
+
+    def region(self, position: Vec4) -> np.ndarray:
+        """Returns a view of the screen region passed in argument one"""
+        return self.crop(position.get_coords())
+
+
+def snapshot(frame: Frame | None = None) -> Frame:
+    """Returns the frame passed in argument one or captures a new one"""
+    return frame if frame is not None else Frame.grab()
@@ -7,6 +7,10 @@ Screen coords for 1920x1080 screens
 from vec4 import Vec4, GameWindow
 from vec2 import Vec2
 
+GAME_WINDOW_POS: Vec4 = Vec4(GameWindow(0, 0, 1920, 1080))
+
+HEALTH_BAR_COLOR: tuple = (0, 255, 18)  # RGB of the health bar shown inside of BENCH_HEALTH_POS for occupied slots
+
 BENCH_HEALTH_POS: list[Vec4] = [
     Vec4(GameWindow(369, 622, 472, 757)),
     Vec4(GameWindow(485, 622, 588, 757)),
@@ -32,6 +36,12 @@ ITEM_POS: list[list] = [
     [Vec2(457, 628), Vec4(GameWindow(559, 670, 797, 701))],
 ]
 
+# Icon boxes centered on the item bench slots in ITEM_POS
+ITEM_ICON_POS: list[Vec4] = [
+    Vec4(GameWindow(slot[0].x_pos - 14, slot[0].y_pos - 14, slot[0].x_pos + 14, slot[0].y_pos + 14))
+    for slot in ITEM_POS
+]
+
 ROUND_POS: Vec4 = Vec4(GameWindow(767, 10, 870, 34))
 
 ROUND_POS_ONE: Vec4 = Vec4(GameWindow(2, 0, 42, 24), use_screen_offset=False)
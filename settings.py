@@ -4,3 +4,4 @@ FORFEIT = False
 FORFEIT_TIME = 600  # Time in seconds
 LEAGUE_CLIENT_PATH = r'C:\\Riot Games\\League of Legends' # Replace with your game path if needed.
 TESSERACT_TESSDATA_PATH = r'C:\\Program Files\\Tesseract-OCR\\tessdata'
+INPUT_PROFILE = "default"  # "fast" only pauses long enough for the game to register input
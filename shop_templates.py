@@ -0,0 +1,131 @@
+"""
+Recognizes champion names in the shop by comparing binarized name crops against a template bank
+Tesseract is only needed when no template is close enough
+The bank is generated offline from recorded shop frames: python shop_templates.py <frames> [bank]
+Shop reads are timed against OCR with: python shop_templates.py benchmark <frames>
+"""
+
+import os
+import sys
+from time import perf_counter
+from typing import Callable
+import cv2
+import numpy as np
+import ocr
+import screen_coords
+import screen_capture
+from screen_capture import CaptureSource, ReplaySource
+
+BANK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates", "shop_names.npz")
+TEMPLATE_SIZE: tuple = (120, 20)  # (width, height) every name crop is resized to
+TEMPLATE_BITS: int = TEMPLATE_SIZE[0] * TEMPLATE_SIZE[1]
+CONFIDENCE_THRESHOLD: float = 0.92
+
+# Number of set bits for every possible byte, used to count differing pixels in packed templates
+POPCOUNT: np.ndarray = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+
+def binarize(image: np.ndarray) -> np.ndarray:
+    """Returns the name crop as a fixed size boolean mask of text pixels"""
+    grayscale = ocr.image_grayscale(np.ascontiguousarray(image[..., :3]))
+    resize = cv2.resize(grayscale, TEMPLATE_SIZE, interpolation=cv2.INTER_AREA)
+    return ocr.image_thresholding(resize) == 0
+
+
+def load_bank(path: str = BANK_PATH) -> tuple[np.ndarray, np.ndarray] | None:
+    """Returns the champion names and packed templates or None if no bank has been generated"""
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as bank:
+        return bank["names"], bank["templates"]
+
+
+BANK: tuple[np.ndarray, np.ndarray] | None = load_bank()
+
+
+def classify(image: np.ndarray) -> tuple[str, float]:
+    """Returns the closest champion name and the share of pixels that matched its template"""
+    if BANK is None:
+        return "", 0.0
+    names, templates = BANK
+    packed: np.ndarray = np.packbits(binarize(image))
+    distances: np.ndarray = POPCOUNT[np.bitwise_xor(templates, packed)].sum(axis=1)
+    best: int = int(np.argmin(distances))
+    return str(names[best]), 1 - distances[best] / TEMPLATE_BITS
+
+
+def build_bank(source: CaptureSource, label: Callable[[np.ndarray], str], path: str = BANK_PATH) -> int:
+    """Labels every shop slot of the recorded frames and saves one majority vote template per name"""
+    screen_capture.set_source(source)
+    samples: dict[str, list[np.ndarray]] = {}
+    while True:
+        try:
+            shop_capture: np.ndarray = screen_capture.Frame.grab().region(screen_coords.SHOP_POS)
+        except EOFError:
+            break
+        for name_pos in screen_coords.CHAMP_NAME_POS:
+            image: np.ndarray = screen_capture.crop(shop_capture, name_pos.get_coords())
+            samples.setdefault(label(image), []).append(binarize(image))
+    names: list[str] = sorted(samples)
+    templates: np.ndarray = np.array(
+        [np.packbits(np.mean(samples[name], axis=0) >= 0.5) for name in names]
+    )
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez(path, names=np.array(names), templates=templates)
+    return len(names)
+
+
+def benchmark(source: CaptureSource, label: Callable[[np.ndarray], str]) -> None:
+    """Times reading every recorded shop with the templates and with OCR and prints how often they agree"""
+    screen_capture.set_source(source)
+    shops: int = 0
+    template_time: float = 0.0
+    ocr_time: float = 0.0
+    confident: int = 0
+    agreed: int = 0
+    while True:
+        try:
+            shop_capture: np.ndarray = screen_capture.Frame.grab().region(screen_coords.SHOP_POS)
+        except EOFError:
+            break
+        images: list[np.ndarray] = [
+            screen_capture.crop(shop_capture, name_pos.get_coords()) for name_pos in screen_coords.CHAMP_NAME_POS
+        ]
+        started: float = perf_counter()
+        matches: list[tuple[str, float]] = [classify(image) for image in images]
+        template_time += perf_counter() - started
+        started = perf_counter()
+        names: list[str] = [label(image) for image in images]
+        ocr_time += perf_counter() - started
+        shops += 1
+        for (champ, confidence), name in zip(matches, names):
+            if confidence >= CONFIDENCE_THRESHOLD:
+                confident += 1
+                agreed += champ == name
+    if not shops:
+        print("No recorded frames found")
+        return
+    print(
+        f"Templates: {template_time / shops * 1000:.2f} ms per shop,"
+        f" {confident}/{shops * len(screen_coords.CHAMP_NAME_POS)} slots confident"
+    )
+    print(f"OCR: {ocr_time / shops * 1000:.2f} ms per shop")
+    print(f"{agreed}/{confident} confident template matches agree with OCR")
+
+
+if __name__ == "__main__":
+    import game_assets
+    from name_matcher import NameMatcher
+
+    # Same match as arena_functions.valid_champ, importing arena_functions here would be circular
+    matcher = NameMatcher(game_assets.CHAMPIONS)
+
+    def ocr_label(image: np.ndarray) -> str:
+        """Reads the name with OCR, uncached so every slot is timed as a fresh read"""
+        champion, ratio = matcher.match(ocr.recognize(ocr.preprocess(image, 3), 7))
+        return champion if ratio >= 0.7 else ""
+
+    if sys.argv[1] == "benchmark":
+        benchmark(ReplaySource(sys.argv[2]), ocr_label)
+    else:
+        print(f"Saved {build_bank(ReplaySource(sys.argv[1]), ocr_label, *sys.argv[2:3])} shop name templates")
@@ -0,0 +1,127 @@
+"""
+Polls cheap screen predicates so actions return as soon as the game confirms them instead of sleeping
+"""
+
+from time import perf_counter, sleep
+from typing import Callable
+import numpy as np
+import screen_capture
+import screen_coords
+
+POLL_INTERVAL: float = 0.05
+
+# Mean per channel difference that counts as a region visibly changing
+CHANGE_THRESHOLD: float = 12.0
+
+
+def wait_until(predicate: Callable[[], bool], timeout: float, poll_interval: float = POLL_INTERVAL) -> bool:
+    """Polls the predicate until it holds or the timeout runs out, returns whether it held"""
+    deadline: float = perf_counter() + timeout
+    while True:
+        if predicate():
+            return True
+        remaining: float = deadline - perf_counter()
+        if remaining <= 0:
+            return False
+        sleep(min(poll_interval, remaining))
+
+
+def region_difference(before: np.ndarray, after: np.ndarray) -> float:
+    """Returns the mean absolute pixel difference between two captures of the same region"""
+    height: int = min(before.shape[0], after.shape[0])
+    width: int = min(before.shape[1], after.shape[1])
+    return float(
+        np.abs(
+            before[:height, :width].astype(np.int16) - after[:height, :width].astype(np.int16)
+        ).mean()
+    )
+
+
+def region_changed(
+    screenxy: tuple,
+    baseline: np.ndarray | None = None,
+    threshold: float = CHANGE_THRESHOLD,
+) -> Callable[[], bool]:
+    """Returns a predicate that holds once the screen box differs from the baseline or its current pixels"""
+    reference: np.ndarray = (
+        baseline.copy() if baseline is not None else screen_capture.grab(screenxy).copy()
+    )
+    return lambda: region_difference(reference, screen_capture.grab(screenxy)) > threshold
+
+
+def bounding_box(boxes: list[tuple]) -> tuple:
+    """Returns the smallest screen box containing every box"""
+    return (
+        min(box[0] for box in boxes),
+        min(box[1] for box in boxes),
+        max(box[2] for box in boxes),
+        max(box[3] for box in boxes),
+    )
+
+
+def loot_collected(confirmations: int = 2) -> Callable[[], bool]:
+    """Returns a predicate that holds once an orb's gold or item shows up in the HUD
+
+    The gold counter and the item bench slots only change once the orb is gone, not when the click marker
+    shows up or the tactician starts walking. The change has to last for confirmations polls in a row so
+    the tactician walking across the item bench doesn't count.
+    """
+    icons: list[tuple] = [position.get_coords() for position in screen_coords.ITEM_ICON_POS]
+    item_bench: tuple = bounding_box(icons)
+    gold_box: tuple = screen_coords.GOLD_POS.get_coords()
+    gold_before: np.ndarray = screen_capture.grab(gold_box).copy()
+    items_before: np.ndarray = screen_capture.grab(item_bench).copy()
+    streak: list[int] = [0]
+
+    def item_changed(items: np.ndarray, icon: tuple) -> bool:
+        box: tuple = (
+            icon[0] - item_bench[0],
+            icon[1] - item_bench[1],
+            icon[2] - item_bench[0],
+            icon[3] - item_bench[1],
+        )
+        before: np.ndarray = screen_capture.crop(items_before, box)
+        return region_difference(before, screen_capture.crop(items, box)) > CHANGE_THRESHOLD
+
+    def predicate() -> bool:
+        items: np.ndarray = screen_capture.grab(item_bench)
+        changed: bool = region_difference(gold_before, screen_capture.grab(gold_box)) > CHANGE_THRESHOLD or any(
+            item_changed(items, icon) for icon in icons
+        )
+        streak[0] = streak[0] + 1 if changed else 0
+        return streak[0] >= confirmations
+
+    return predicate
+
+
+def bench_slot_occupied(slot: int, occupied: bool = True) -> Callable[[], bool]:
+    """Returns a predicate that holds once the bench slot shows (or stops showing) a health bar"""
+
+    def predicate() -> bool:
+        region: np.ndarray = screen_capture.grab(
+            screen_coords.BENCH_HEALTH_POS[slot].get_coords()
+        ).astype(np.int16)
+        health_bar: bool = bool(
+            (np.abs(region - screen_coords.HEALTH_BAR_COLOR) <= 3).all(axis=2).any()
+        )
+        return health_bar == occupied
+
+    return predicate
+
+
+def shop_slot_changed(slot: int) -> Callable[[], bool]:
+    """Returns a predicate that holds once the shop card's name changes, for example when it greys out after buying"""
+    shop: tuple = screen_coords.SHOP_POS.get_coords()
+    name: tuple = screen_coords.CHAMP_NAME_POS[slot].get_coords()
+    # Shop card names are relative to the shop bar
+    return region_changed((shop[0] + name[0], shop[1] + name[1], shop[0] + name[2], shop[1] + name[3]))
+
+
+def anvil_prompt_changed() -> Callable[[], bool]:
+    """Returns a predicate that holds once the anvil prompt appears or goes away"""
+    return region_changed(screen_coords.ANVIL_MSG_POS.get_coords())
+
+
+def round_label_changed() -> Callable[[], bool]:
+    """Returns a predicate that holds once the round label changes"""
+    return region_changed(screen_coords.ROUND_POS.get_coords())